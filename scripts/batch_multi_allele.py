@@ -4,7 +4,7 @@ Script: batch_multi_allele.py
 Description: Batch prediction with multiple MHC alleles
 
 Original Use Case: examples/use_case_4_batch_multi_allele.py
-Dependencies Removed: pandas (optional, only used for CSV output)
+Dependencies Removed: pandas (Excel output uses xlsxwriter or openpyxl directly)
 
 Usage:
     python scripts/batch_multi_allele.py --input <input_file> --alleles <allele1>,<allele2>
@@ -15,29 +15,67 @@ Example:
 """
 
 # ==============================================================================
-# Minimal Imports (only standard library + optional pandas)
+# Minimal Imports (only standard library + optional xlsxwriter/openpyxl)
 # ==============================================================================
 import argparse
 import sys
+from contextlib import contextmanager
+from functools import lru_cache
 import csv
+import logging
+import queue
+import shutil
+import tempfile
 from pathlib import Path
-from typing import Union, Optional, Dict, Any, List
-import json
+from typing import Union, Optional, Dict, Any, List, Tuple, Iterator, Iterable, IO, Sequence, AbstractSet
+from itertools import repeat
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Add the lib directory to the path for our utilities
-sys.path.insert(0, str(Path(__file__).parent / "lib"))
+# Add the lib directory to the path for our utilities (only once, since the
+# server imports several scripts into the same process)
+_LIB_DIR = str(Path(__file__).parent / "lib")
+if _LIB_DIR not in sys.path:
+    sys.path.insert(0, _LIB_DIR)
 
 from utils import create_temp_peptide_file, create_temp_fasta_file, validate_input_file, save_output, safe_file_cleanup
-from netmhciipan import run_netmhciipan
-from parsers import parse_netmhciipan_output, format_summary_report
+from netmhciipan import run_netmhciipan, cpu_set_for_slot, drain_stream
+from parsers import parse_netmhciipan_output, parse_netmhciipan_sections, format_summary_report, PREDICTION_FIELDS
+from jsonio import load_config
+
+# Progress messages go through logging rather than print, so callers that own
+# stdout (e.g. the MCP server's stdio transport) are not written to; the CLI
+# routes them back to stdout in main()
+logger = logging.getLogger("batch_multi_allele")
+
+# Optional Excel writers; xlsxwriter is preferred as it is considerably
+# faster for value-only sheets, openpyxl is the fallback
+try:
+    import xlsxwriter
+    HAS_XLSXWRITER = True
+except ImportError:
+    HAS_XLSXWRITER = False
 
-# Optional pandas import for Excel output
 try:
-    import pandas as pd
-    HAS_PANDAS = True
+    import openpyxl
+    HAS_OPENPYXL = True
 except ImportError:
-    HAS_PANDAS = False
+    HAS_OPENPYXL = False
+
+# openpyxl serializes through lxml when it is installed, and through the much
+# slower stdlib ElementTree otherwise
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+if HAS_XLSXWRITER:
+    EXCEL_ENGINE = 'xlsxwriter'
+elif HAS_OPENPYXL:
+    EXCEL_ENGINE = 'openpyxl'
+else:
+    EXCEL_ENGINE = None
 
 # ==============================================================================
 # Configuration
@@ -47,114 +85,413 @@ DEFAULT_CONFIG = {
     "context": False,
     "output_format": "csv",
     "include_summary": True,
-    "max_parallel_jobs": 4
+    "max_parallel_jobs": 4,
+    "retain_raw_output": False,
+    "raw_passthrough": False,
+    "pin_cpus": False,
+    "strong_only": False
 }
 
+# Accepted allele names: NetMHCIIpan style identifiers such as DRB1_0101,
+# HLA-DQA10501-DQB10201 or H-2-IAb. Anything else (empty entries, spaces,
+# stray punctuation) is rejected before any subprocess is launched.
+_ALLELE_RE = re.compile(r'[A-Za-z0-9][A-Za-z0-9_:*-]*\Z')
+
+# Separators that differ between spellings of one allele (DRB1_0101,
+# DRB1*01:01, HLA-DQA10501-DQB10201); dropped when comparing names
+_ALLELE_SEPARATORS_RE = re.compile(r'[^A-Z0-9]')
+
 # ==============================================================================
-# CSV Output Functions (pandas-free)
+# Output Functions (pandas-free)
 # ==============================================================================
-def format_predictions_to_csv(all_results: Dict[str, Dict]) -> List[List[str]]:
+CSV_HEADER = ["allele", *PREDICTION_FIELDS]
+
+# Prediction fields in CSV column order (everything after "allele")
+_CSV_KEYS = PREDICTION_FIELDS
+
+# Write buffer for CSV output; large outputs are flushed in 1 MiB chunks
+# instead of the default 8 KiB
+CSV_BUFFER_SIZE = 1 << 20
+
+SUMMARY_HEADER = ["allele", "total_predictions", "strong_binders", "weak_binders", "non_binders"]
+
+
+def _iter_csv_rows(all_results: Dict[str, Dict]) -> Iterator[Sequence[Any]]:
     """
-    Convert prediction results to CSV format without pandas dependency.
+    Lazily yield CSV rows (header first) from columnar prediction results.
 
     Args:
-        all_results: Dict mapping allele names to parsed results
+        all_results: Dict mapping allele names to columnar parsed results
 
-    Returns:
-        List of lists representing CSV rows
+    Yields:
+        Sequence representing a single CSV row
     """
-    # Create CSV header
-    header = [
-        "allele", "position", "mhc", "peptide", "core", "of", "gp", "gl",
-        "ip", "il", "icore", "identity", "score", "rank", "exp_bind", "bind_level"
-    ]
-
-    rows = [header]
+    yield CSV_HEADER
 
-    # Add data rows
     for allele_name, result in all_results.items():
-        for prediction in result.get('all_predictions', []):
-            row = [
-                allele_name,
-                prediction.get('position', ''),
-                prediction.get('mhc', ''),
-                prediction.get('peptide', ''),
-                prediction.get('core', ''),
-                prediction.get('of', ''),
-                prediction.get('gp', ''),
-                prediction.get('gl', ''),
-                prediction.get('ip', ''),
-                prediction.get('il', ''),
-                prediction.get('icore', ''),
-                prediction.get('identity', ''),
-                prediction.get('score', ''),
-                prediction.get('rank', ''),
-                prediction.get('exp_bind', ''),
-                prediction.get('bind_level', '')
-            ]
-            rows.append(row)
-
-    return rows
-
-
-def save_csv_output(csv_data: List[List[str]], output_file: Union[str, Path]) -> None:
+        columns = result.get('columns')
+        if columns:
+            yield from zip(repeat(allele_name), *(columns[key] for key in _CSV_KEYS))
+
+
+def save_csv_output(all_results: Dict[str, Dict], output_file: Union[str, Path]) -> None:
     """
-    Save CSV data to file.
+    Stream prediction results to a CSV file without building the rows in memory.
 
     Args:
-        csv_data: List of lists representing CSV rows
+        all_results: Dict mapping allele names to parsed results
         output_file: Output file path
     """
     output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+    with open(output_path, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
         writer = csv.writer(f)
-        writer.writerows(csv_data)
+        writer.writerows(_iter_csv_rows(all_results))
+
+
+def stream_raw_to_csv(lines: Iterable[str], allele: str, writer: Any) -> Dict[str, int]:
+    """
+    Copy NetMHCIIpan result rows straight into a CSV writer.
+
+    Each data line of the results section is split on whitespace and written
+    verbatim (numbers keep NetMHCIIpan's formatting, "NA" is not converted)
+    with the allele prepended, skipping per-prediction dicts entirely. Only
+    the rank column is inspected, to count binders.
+
+    Args:
+        lines: NetMHCIIpan output lines (e.g. a streamed process)
+        allele: Allele name for the first CSV column
+        writer: csv.writer to receive the rows
+
+    Returns:
+        dict: Summary counts in the same shape as parse_netmhciipan_output
+    """
+    n_columns = len(_CSV_KEYS)
+    total = strong = weak = 0
+    in_results_section = False
+
+    for line in lines:
+        if not in_results_section:
+            if line.startswith(' Pos ') and 'MHC' in line and 'Peptide' in line:
+                in_results_section = True
+            continue
+
+        if not line.strip() or line.startswith('-'):
+            continue
+        if line.startswith('Number of'):
+            break
+
+        fields = line.split()
+        if len(fields) < 10:
+            continue
+
+        # Pad/trim to the CSV column count so rows stay rectangular
+        fields = fields[:n_columns] + [''] * (n_columns - len(fields))
+        writer.writerow([allele, *fields])
+        total += 1
+
+        try:
+            rank = float(fields[12])
+        except (IndexError, ValueError):
+            continue
+        if rank <= 1.0:
+            strong += 1
+        elif rank <= 5.0:
+            weak += 1
+
+    return {
+        'total_predictions': total,
+        'strong_binders_count': strong,
+        'weak_binders_count': weak,
+        'non_binders_count': total - strong - weak
+    }
+
+
+def _iter_summary_rows(all_results: Dict[str, Dict]) -> Iterator[List[Any]]:
+    """
+    Lazily yield per-allele summary rows (header first) for the Excel summary sheet.
+
+    Args:
+        all_results: Dict mapping allele names to parsed results
+
+    Yields:
+        List representing a single summary row
+    """
+    yield SUMMARY_HEADER
+
+    for allele_name, result in all_results.items():
+        summary = result.get('summary', {})
+        yield [
+            allele_name,
+            summary.get('total_predictions', 0),
+            summary.get('strong_binders_count', 0),
+            summary.get('weak_binders_count', 0),
+            summary.get('non_binders_count', 0)
+        ]
 
 
 def save_excel_output(all_results: Dict[str, Dict], output_file: Union[str, Path]) -> None:
     """
-    Save results to Excel file (requires pandas).
+    Save results to Excel file (requires xlsxwriter or openpyxl).
+
+    Rows are streamed into the workbook rather than held in memory: xlsxwriter
+    runs in constant_memory mode, and the openpyxl fallback uses a write-only
+    workbook (serialized through lxml automatically when it is installed).
 
     Args:
         all_results: Dict mapping allele names to parsed results
         output_file: Output file path
     """
-    if not HAS_PANDAS:
-        raise ImportError("pandas is required for Excel output. Install with: pip install pandas openpyxl")
+    if EXCEL_ENGINE is None:
+        raise ImportError("xlsxwriter or openpyxl is required for Excel output. Install with: pip install xlsxwriter")
 
     output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-        # Create summary sheet
-        summary_data = []
-        for allele_name, result in all_results.items():
-            summary = result.get('summary', {})
-            summary_data.append({
-                'allele': allele_name,
-                'total_predictions': summary.get('total_predictions', 0),
-                'strong_binders': summary.get('strong_binders_count', 0),
-                'weak_binders': summary.get('weak_binders_count', 0),
-                'non_binders': summary.get('non_binders_count', 0)
-            })
-
-        summary_df = pd.DataFrame(summary_data)
-        summary_df.to_excel(writer, sheet_name='Summary', index=False)
-
-        # Create detailed results sheet
-        csv_data = format_predictions_to_csv(all_results)
-        if len(csv_data) > 1:  # Has data beyond header
-            header = csv_data[0]
-            data_rows = csv_data[1:]
-            details_df = pd.DataFrame(data_rows, columns=header)
-            details_df.to_excel(writer, sheet_name='Detailed_Results', index=False)
+    sheets = [
+        ('Summary', _iter_summary_rows(all_results)),
+        ('Detailed_Results', _iter_csv_rows(all_results)),
+    ]
+
+    if EXCEL_ENGINE == 'xlsxwriter':
+        wb = xlsxwriter.Workbook(str(output_path), {'constant_memory': True})
+        for sheet_name, rows in sheets:
+            ws = wb.add_worksheet(sheet_name)
+            for row_idx, row in enumerate(rows):
+                ws.write_row(row_idx, 0, row)
+        wb.close()
+    else:
+        if not HAS_LXML:
+            logger.warning("lxml is not installed; openpyxl Excel output will be slow. Install with: pip install lxml")
+        wb = openpyxl.Workbook(write_only=True)
+        for sheet_name, rows in sheets:
+            ws = wb.create_sheet(sheet_name)
+            for row in rows:
+                ws.append(row)
+        wb.save(output_path)
 
 
 # ==============================================================================
 # Core Function
 # ==============================================================================
+def _error_result(error: Exception) -> Dict[str, Any]:
+    """Build the empty result recorded for an allele whose prediction failed."""
+    return {
+        'error': str(error),
+        'columns': {},
+        'n': 0,
+        'summary': {'total_predictions': 0, 'strong_binders_count': 0,
+                   'weak_binders_count': 0, 'non_binders_count': 0}
+    }
+
+
+def _predict_combined(
+    alleles: List[str],
+    input_file: str,
+    input_type: str,
+    context: bool,
+    strong_only: bool = False
+) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Run NetMHCIIpan once for all alleles and split the output per allele.
+
+    NetMHCIIpan accepts a comma-separated allele list and prints one results
+    section per allele, which saves a process start and model load per allele.
+    Each section is assigned to an allele by its MHC column. The combined
+    output has no per-allele raw text, so callers that retain raw output
+    use one run per allele instead.
+
+    Args:
+        alleles: MHC allele names
+        input_file: Path to prepared input file
+        input_type: "peptide" or "protein"
+        context: Use context-aware prediction
+        strong_only: Keep only strong binders (summary counts cover all)
+
+    Returns:
+        Dict mapping allele names to parsed results, or None if the combined
+        run failed or its sections could not be matched to the alleles (the
+        caller then falls back to one run per allele)
+    """
+    section_mhcs = []
+    try:
+        lines = run_netmhciipan(
+            input_file=input_file,
+            allele=','.join(alleles),
+            input_type=input_type,
+            context=context,
+            stream=True
+        )
+        sections = parse_netmhciipan_sections(
+            _record_section_mhcs(lines, section_mhcs), columnar=True, strong_only=strong_only
+        )
+    except Exception:
+        return None
+
+    if len(sections) != len(alleles) or len(section_mhcs) != len(alleles):
+        return None
+
+    results = {}
+    for allele, mhc, section in zip(alleles, section_mhcs, sections):
+        if _normalize_allele(mhc) != _normalize_allele(allele):
+            return None
+        results[allele] = section
+    return results
+
+
+def _record_section_mhcs(lines: Iterable[str], mhcs: List[str]) -> Iterator[str]:
+    """
+    Pass output lines through, noting the MHC column of each section.
+
+    The MHC name is read from the first prediction row after each results
+    header and appended to `mhcs`; a section without rows adds nothing.
+    This works before any strong_only filtering, which may drop every row.
+    """
+    want_mhc = False
+    for line in lines:
+        if line.startswith(' Pos ') and 'MHC' in line and 'Peptide' in line:
+            want_mhc = True
+        elif want_mhc and line.startswith('Number of'):
+            want_mhc = False
+        elif want_mhc and not line.startswith('-'):
+            fields = line.split()
+            if len(fields) >= 10:
+                mhcs.append(fields[1])
+                want_mhc = False
+        yield line
+
+
+def _normalize_allele(name: str) -> str:
+    """Reduce an allele name to a separator-free form for comparison."""
+    name = name.upper()
+    if name.startswith('HLA-'):
+        name = name[4:]
+    return _ALLELE_SEPARATORS_RE.sub('', name)
+
+
+@contextmanager
+def _borrowed_cpus(cpu_pool: Optional["queue.Queue[Optional[AbstractSet[int]]]"]) -> Iterator[Optional[AbstractSet[int]]]:
+    """
+    Take a free CPU set from the pool for the duration of one run.
+
+    Args:
+        cpu_pool: Queue of CPU sets not in use by a running worker, or None
+            to run unpinned
+
+    Yields:
+        CPU set to pin the NetMHCIIpan process to, or None
+    """
+    if cpu_pool is None:
+        yield None
+        return
+    cpus = cpu_pool.get()
+    try:
+        yield cpus
+    finally:
+        cpu_pool.put(cpus)
+
+
+def _predict_one(
+    allele: str,
+    input_file: str,
+    input_type: str,
+    context: bool,
+    retain_raw_output: bool = False,
+    cpu_pool: Optional["queue.Queue[Optional[AbstractSet[int]]]"] = None,
+    strong_only: bool = False
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Run and parse NetMHCIIpan for a single allele.
+
+    Errors are captured in the returned result so that one failing allele
+    does not cancel the rest of the batch.
+
+    Args:
+        allele: MHC allele name
+        input_file: Path to prepared input file
+        input_type: "peptide" or "protein"
+        context: Use context-aware prediction
+        retain_raw_output: Keep the raw NetMHCIIpan text in the result
+        cpu_pool: Free CPU sets shared by the workers; one is held while
+            NetMHCIIpan runs
+        strong_only: Keep only strong binders (summary counts cover all)
+
+    Returns:
+        Tuple of (allele, parsed results or error dict)
+    """
+    try:
+        with _borrowed_cpus(cpu_pool) as cpus:
+            # Run NetMHCIIpan for this allele; unless the raw text is wanted,
+            # stream its output straight into the parser
+            raw_output = run_netmhciipan(
+                input_file=input_file,
+                allele=allele,
+                input_type=input_type,
+                context=context,
+                stream=not retain_raw_output,
+                cpus=cpus
+            )
+
+            # Parse results into per-field columns
+            parsed_results = parse_netmhciipan_output(raw_output, columnar=True, strong_only=strong_only)
+            entry = dict(parsed_results)
+            if retain_raw_output:
+                entry['raw_output'] = raw_output
+            else:
+                drain_stream(raw_output)
+        return allele, entry
+
+    except Exception as e:
+        return allele, _error_result(e)
+
+
+def _passthrough_one(
+    allele: str,
+    part_file: IO[str],
+    input_file: str,
+    input_type: str,
+    context: bool,
+    cpu_pool: Optional["queue.Queue[Optional[AbstractSet[int]]]"] = None
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Run NetMHCIIpan for a single allele, piping its rows into a CSV part file.
+
+    Args:
+        allele: MHC allele name
+        part_file: Text file receiving this allele's CSV rows
+        input_file: Path to prepared input file
+        input_type: "peptide" or "protein"
+        context: Use context-aware prediction
+        cpu_pool: Free CPU sets shared by the workers; one is held while
+            NetMHCIIpan runs
+
+    Returns:
+        Tuple of (allele, summary-only result or error dict)
+    """
+    try:
+        with _borrowed_cpus(cpu_pool) as cpus:
+            lines = run_netmhciipan(
+                input_file=input_file,
+                allele=allele,
+                input_type=input_type,
+                context=context,
+                stream=True,
+                cpus=cpus
+            )
+            summary = stream_raw_to_csv(lines, allele, csv.writer(part_file))
+            drain_stream(lines)
+        return allele, {
+            'columns': {},
+            'n': 0,
+            'summary': summary
+        }
+
+    except Exception as e:
+        part_file.truncate(0)
+        return allele, _error_result(e)
+
+
 def run_batch_multi_allele(
     input_file: Optional[Union[str, Path]] = None,
     peptides: Optional[List[str]] = None,
@@ -184,8 +521,10 @@ def run_batch_multi_allele(
 
     Returns:
         Dict containing:
-            - results: Dict mapping allele names to parsed results
-            - summary_stats: Overall summary statistics
+            - results: Dict mapping allele names to parsed results in
+              columnar form ('columns' field -> list of values, 'n', 'summary')
+            - summary_stats: Overall summary statistics, including the
+              successful/failed allele names
             - output_file: Path to output file (if saved)
             - metadata: Execution metadata
 
@@ -212,8 +551,16 @@ def run_batch_multi_allele(
     if not alleles or len(alleles) == 0:
         raise ValueError("At least one allele must be provided")
 
+    bad_alleles = [a for a in alleles if not _ALLELE_RE.fullmatch(a)]
+    if bad_alleles:
+        raise ValueError(f"Invalid allele name(s): {', '.join(repr(a) for a in bad_alleles)}")
+
+    # Each allele only needs to run once
+    alleles = list(dict.fromkeys(alleles))
+
     temp_file = None
-    all_results = {}
+    completed = {}
+    csv_parts = {}
 
     try:
         # Prepare input file
@@ -228,47 +575,95 @@ def run_batch_multi_allele(
         else:
             final_input_file = str(validate_input_file(input_file))
 
-        # Run predictions for each allele
+        # Run predictions for each allele in parallel; each call blocks on its
+        # own NetMHCIIpan subprocess, so threads are sufficient here
+        max_workers = max(1, min(final_config["max_parallel_jobs"], len(alleles)))
+        logger.info("Processing %d alleles (%d in parallel)...", len(alleles), max_workers)
+        # In raw passthrough mode, each allele pipes its rows into its own
+        # spooled CSV part, and the parts are joined in allele order below
+        # (not with strong_only, which needs the parsed rank of each row)
+        raw_passthrough = (bool(output_file) and not excel_output and final_config["raw_passthrough"]
+                           and not final_config["strong_only"])
+
+        # When the run is serial anyway, a single NetMHCIIpan invocation over
+        # the whole allele list replaces one process per allele (not when raw
+        # text is retained, as the combined output has none per allele)
+        if (max_workers == 1 and len(alleles) > 1 and not raw_passthrough
+                and not final_config["retain_raw_output"]):
+            completed = _predict_combined(
+                alleles, final_input_file, input_type, context, final_config["strong_only"]
+            ) or {}
+            for allele, allele_result in completed.items():
+                logger.info("  ✅ %s: %d predictions", allele, allele_result['summary']['total_predictions'])
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = [allele for allele in alleles if allele not in completed]
+            # Give each running NetMHCIIpan process its own core so the
+            # scheduler does not migrate it (and its warm caches) mid-run;
+            # a worker takes a free core when it starts a run and returns it
+            # when the run ends
+            cpu_pool = None
+            if max_workers > 1 and final_config["pin_cpus"]:
+                cpu_pool = queue.Queue()
+                for slot in range(max_workers):
+                    cpu_pool.put(cpu_set_for_slot(slot))
+            if raw_passthrough:
+                for allele in pending:
+                    csv_parts[allele] = tempfile.TemporaryFile(
+                        'w+', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE
+                    )
+                futures = [
+                    executor.submit(
+                        _passthrough_one, allele, csv_parts[allele], final_input_file,
+                        input_type, context, cpu_pool
+                    )
+                    for allele in pending
+                ]
+            else:
+                futures = [
+                    executor.submit(
+                        _predict_one, allele, final_input_file, input_type, context,
+                        final_config["retain_raw_output"], cpu_pool, final_config["strong_only"]
+                    )
+                    for allele in pending
+                ]
+            for future in as_completed(futures):
+                allele, allele_result = future.result()
+                completed[allele] = allele_result
+
+                # Progress is reported from this (main) thread only, in
+                # completion order, so worker threads never contend for it
+                if 'error' in allele_result:
+                    logger.warning("  ❌ %s: Error - %s", allele, allele_result['error'])
+                else:
+                    logger.info("  ✅ %s: %d predictions", allele, allele_result['summary']['total_predictions'])
+
+        # Restore the requested allele order, partitioning successes and
+        # failures and accumulating summary statistics in the same pass
+        all_results = {}
+        successful = []
+        failed = []
+        total_predictions = total_strong = total_weak = 0
         for allele in alleles:
-            print(f"Processing allele: {allele}...")
-
-            try:
-                # Run NetMHCIIpan for this allele
-                raw_output = run_netmhciipan(
-                    input_file=final_input_file,
-                    allele=allele,
-                    input_type=input_type,
-                    context=context
-                )
-
-                # Parse results
-                parsed_results = parse_netmhciipan_output(raw_output)
-                all_results[allele] = {
-                    **parsed_results,
-                    'raw_output': raw_output
-                }
-
-                print(f"  ✅ {allele}: {len(parsed_results.get('all_predictions', []))} predictions")
-
-            except Exception as e:
-                print(f"  ❌ {allele}: Error - {e}")
-                all_results[allele] = {
-                    'error': str(e),
-                    'strong_binders': [],
-                    'weak_binders': [],
-                    'all_predictions': [],
-                    'summary': {'total_predictions': 0, 'strong_binders_count': 0,
-                               'weak_binders_count': 0, 'non_binders_count': 0}
-                }
-
-        # Calculate summary statistics
+            r = all_results[allele] = completed[allele]
+            if 'error' in r:
+                failed.append(allele)
+            else:
+                successful.append(allele)
+            summary = r.get('summary', {})
+            total_predictions += summary.get('total_predictions', 0)
+            total_strong += summary.get('strong_binders_count', 0)
+            total_weak += summary.get('weak_binders_count', 0)
+
         summary_stats = {
             'total_alleles': len(alleles),
-            'successful_alleles': len([r for r in all_results.values() if 'error' not in r]),
-            'failed_alleles': len([r for r in all_results.values() if 'error' in r]),
-            'total_predictions': sum(len(r.get('all_predictions', [])) for r in all_results.values()),
-            'total_strong_binders': sum(len(r.get('strong_binders', [])) for r in all_results.values()),
-            'total_weak_binders': sum(len(r.get('weak_binders', [])) for r in all_results.values())
+            'successful_alleles': len(successful),
+            'failed_alleles': len(failed),
+            'successful_allele_names': successful,
+            'failed_allele_names': failed,
+            'total_predictions': total_predictions,
+            'total_strong_binders': total_strong,
+            'total_weak_binders': total_weak
         }
 
         # Save output if requested
@@ -278,9 +673,15 @@ def run_batch_multi_allele(
 
             if excel_output:
                 save_excel_output(all_results, output_path)
+            elif raw_passthrough:
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(output_path, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
+                    csv.writer(f).writerow(CSV_HEADER)
+                    for allele in alleles:
+                        csv_parts[allele].seek(0)
+                        shutil.copyfileobj(csv_parts[allele], f, CSV_BUFFER_SIZE)
             else:
-                csv_data = format_predictions_to_csv(all_results)
-                save_csv_output(csv_data, output_path)
+                save_csv_output(all_results, output_path)
 
         return {
             "results": all_results,
@@ -297,14 +698,18 @@ def run_batch_multi_allele(
         }
 
     finally:
-        # Clean up temporary file
+        # Clean up temporary files
         safe_file_cleanup(temp_file)
+        for part_file in csv_parts.values():
+            part_file.close()
 
 
 # ==============================================================================
 # CLI Interface
 # ==============================================================================
-def main():
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser (once per process)."""
     parser = argparse.ArgumentParser(
         description=__doc__,
         formatter_class=argparse.RawDescriptionHelpFormatter
@@ -347,7 +752,17 @@ def main():
     parser.add_argument(
         '--excel',
         action='store_true',
-        help='Generate Excel output (requires pandas)'
+        help='Generate Excel output (requires xlsxwriter or openpyxl)'
+    )
+    parser.add_argument(
+        '--raw-passthrough',
+        action='store_true',
+        help='Write NetMHCIIpan rows straight to CSV without parsing (CSV output only)'
+    )
+    parser.add_argument(
+        '--strong-only',
+        action='store_true',
+        help='Keep only strong binders (rank <= 1%%) in the results and output file'
     )
     parser.add_argument(
         '--config',
@@ -364,14 +779,26 @@ def main():
         help='Show detailed output for each allele'
     )
 
+    return parser
+
+
+def main():
+    parser = _build_parser()
     args = parser.parse_args()
 
+    # Show batch progress on stdout, as plain lines
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+
     try:
         # Load config if provided
         config = None
         if args.config:
-            with open(args.config) as f:
-                config = json.load(f)
+            config = load_config(args.config)
+
+        if args.raw_passthrough:
+            config = {**(config or {}), "raw_passthrough": True}
+        if args.strong_only:
+            config = {**(config or {}), "strong_only": True}
 
         # Parse alleles
         alleles = [a.strip() for a in args.alleles.split(',')]
@@ -409,13 +836,13 @@ def main():
 
         # Print detailed results if requested
         if args.verbose:
-            for allele, allele_result in result['results'].items():
+            stats = result['summary_stats']
+            for allele in stats['failed_allele_names']:
                 print(f"\n--- {allele} ---")
-                if 'error' in allele_result:
-                    print(f"❌ Error: {allele_result['error']}")
-                else:
-                    summary_report = format_summary_report(allele_result)
-                    print(summary_report)
+                print(f"❌ Error: {result['results'][allele]['error']}")
+            for allele in stats['successful_allele_names']:
+                print(f"\n--- {allele} ---")
+                print(format_summary_report(result['results'][allele]))
 
         # Print success message
         if result['output_file']:
@@ -19,16 +19,24 @@ Example:
 # ==============================================================================
 import argparse
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Union, Optional, Dict, Any, List
-import json
-
-# Add the lib directory to the path for our utilities
-sys.path.insert(0, str(Path(__file__).parent / "lib"))
-
-from utils import create_temp_peptide_file, create_temp_fasta_file, validate_input_file, save_output, safe_file_cleanup
+from typing import Union, Optional, Dict, Any, List, Sequence
+
+# Add the lib directory to the path for our utilities (only once, since the
+# server imports several scripts into the same process)
+_LIB_DIR = str(Path(__file__).parent / "lib")
+if _LIB_DIR not in sys.path:
+    sys.path.insert(0, _LIB_DIR)
+
+from utils import (
+    create_temp_peptide_file, create_temp_fasta_file, format_peptide_input, format_fasta_input,
+    validate_input_file, safe_file_cleanup, save_output
+)
 from netmhciipan import run_netmhciipan
-from parsers import parse_netmhciipan_output, format_summary_report
+from parsers import parse_netmhciipan_output, format_summary_report, SUMMARY_FIELDS
+from jsonio import load_config
+from outputcache import output_cache_key, file_fingerprint, load_cached_output, store_cached_output
 
 # ==============================================================================
 # Configuration
@@ -37,7 +45,8 @@ DEFAULT_CONFIG = {
     "input_type": "peptide",
     "output_format": "text",
     "use_alpha_chain": True,
-    "use_beta_chain": True
+    "use_beta_chain": True,
+    "cache": True
 }
 
 # ==============================================================================
@@ -53,6 +62,8 @@ def run_custom_allele_prediction(
     input_type: str = "peptide",
     output_file: Optional[Union[str, Path]] = None,
     config: Optional[Dict[str, Any]] = None,
+    parse: bool = True,
+    fields: Optional[Sequence[str]] = None,
     **kwargs
 ) -> Dict[str, Any]:
     """
@@ -68,11 +79,16 @@ def run_custom_allele_prediction(
         input_type: "peptide" or "protein"
         output_file: Path to save output (optional)
         config: Configuration dict (uses DEFAULT_CONFIG if not provided)
+        parse: Parse the predictions; when False, 'result' is None (e.g.
+            when only the raw output file is wanted)
+        fields: Prediction fields to parse (default: all), e.g.
+            SUMMARY_FIELDS when only a summary report is needed
         **kwargs: Override specific config parameters
 
     Returns:
         Dict containing:
-            - result: Main computation result (parsed predictions)
+            - result: Main computation result (parsed predictions, or None
+              if parse is False)
             - raw_output: Raw NetMHCIIpan output text
             - output_file: Path to output file (if saved)
             - metadata: Execution metadata
@@ -110,41 +126,68 @@ def run_custom_allele_prediction(
 
     temp_file = None
     try:
-        # Prepare input file
+        # Collect the input text for inline sequences
+        input_text = None
         if peptides:
-            temp_file = create_temp_peptide_file(peptides)
-            final_input_file = temp_file
+            input_text = format_peptide_input(peptides)
             input_type = "peptide"
         elif proteins:
-            # Create temporary file with multiple protein sequences
-            temp_file_obj = create_temp_fasta_file("", "temp")  # Create temp file handle
-            temp_file = temp_file_obj
-            with open(temp_file, 'w') as f:
-                for i, protein in enumerate(proteins):
-                    f.write(f">protein_{i+1}\n{protein}\n")
-            final_input_file = temp_file
+            input_text = ''.join([
+                format_fasta_input(protein, f"protein_{i+1}")
+                for i, protein in enumerate(proteins)
+            ])
             input_type = "protein"
         else:
-            final_input_file = str(validate_input_file(input_file))
-
-        # Run NetMHCIIpan with custom sequences
-        raw_output = run_netmhciipan(
-            input_file=final_input_file,
-            allele="",  # Not used with custom sequences
-            input_type=input_type,
-            alpha_seq=str(alpha_seq_file) if alpha_seq_file else None,
-            beta_seq=str(beta_seq_file) if beta_seq_file else None,
-            custom_seq=str(combined_seq_file) if combined_seq_file else None
-        )
-
-        # Parse results
-        parsed_results = parse_netmhciipan_output(raw_output)
-
-        # Save output if requested
-        output_path = None
-        if output_file:
-            output_path = Path(output_file)
-            save_output(raw_output, output_path)
+            input_file = validate_input_file(input_file)
+
+        # Reuse the output of an earlier run on the same input and MHC
+        # sequences, if cached; the sequence files are keyed by their
+        # contents, so editing one in place is not answered from the cache
+        cache_key = None
+        raw_output = None
+        if final_config["cache"]:
+            seq_files = {"alpha": alpha_seq_file, "beta": beta_seq_file, "combined": combined_seq_file}
+            mhc = [f"{chain}:{file_fingerprint(seq_file)}"
+                   for chain, seq_file in seq_files.items() if seq_file]
+            cache_input = input_text if input_text is not None else input_file.read_text()
+            cache_key = output_cache_key(input_type, cache_input, *mhc)
+            raw_output = load_cached_output(cache_key)
+
+        if raw_output is not None:
+            if output_file:
+                save_output(raw_output, output_file)
+        else:
+            # Prepare input file
+            if peptides:
+                temp_file = create_temp_peptide_file(peptides)
+                final_input_file = temp_file
+            elif proteins:
+                # Create temporary file with multiple protein sequences
+                temp_file = create_temp_fasta_file("", "temp")  # Create temp file handle
+                with open(temp_file, 'w') as f:
+                    f.write(input_text)
+                final_input_file = temp_file
+            else:
+                final_input_file = str(input_file)
+
+            # Run NetMHCIIpan with custom sequences
+            raw_output = run_netmhciipan(
+                input_file=final_input_file,
+                allele="",  # Not used with custom sequences
+                input_type=input_type,
+                alpha_seq=str(alpha_seq_file) if alpha_seq_file else None,
+                beta_seq=str(beta_seq_file) if beta_seq_file else None,
+                custom_seq=str(combined_seq_file) if combined_seq_file else None,
+                stdout_path=output_file
+            )
+            if cache_key:
+                store_cached_output(cache_key, raw_output)
+
+        # Parse results, unless the caller only wants the raw output
+        parsed_results = parse_netmhciipan_output(raw_output, fields=fields) if parse else None
+
+        # NetMHCIIpan has already written the output file, if one was requested
+        output_path = Path(output_file) if output_file else None
 
         return {
             "result": parsed_results,
@@ -170,7 +213,9 @@ def run_custom_allele_prediction(
 # ==============================================================================
 # CLI Interface
 # ==============================================================================
-def main():
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser (once per process)."""
     parser = argparse.ArgumentParser(
         description=__doc__,
         formatter_class=argparse.RawDescriptionHelpFormatter
@@ -228,7 +273,17 @@ def main():
         action='store_true',
         help='Show full NetMHCIIpan output'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always run NetMHCIIpan instead of reusing cached output'
+    )
 
+    return parser
+
+
+def main():
+    parser = _build_parser()
     args = parser.parse_args()
 
     try:
@@ -239,8 +294,9 @@ def main():
         # Load config if provided
         config = None
         if args.config:
-            with open(args.config) as f:
-                config = json.load(f)
+            config = load_config(args.config)
+        if args.no_cache:
+            config = {**(config or {}), "cache": False}
 
         # Prepare input data
         peptides = None
@@ -260,7 +316,9 @@ def main():
             combined_seq_file=args.combined_seq,
             input_type=args.input_type,
             output_file=args.output,
-            config=config
+            config=config,
+            parse=args.summary,
+            fields=SUMMARY_FIELDS
         )
 
         # Print summary if requested
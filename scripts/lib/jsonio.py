@@ -0,0 +1,75 @@
+"""
+JSON I/O helpers for NetMHCIIpan MCP scripts.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise, so callers get the same str/bytes-in, str-out interface either way.
+"""
+
+import copy
+import os
+from functools import lru_cache
+from typing import Any, Dict, Union
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    import json
+    HAS_ORJSON = False
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON document.
+
+    Args:
+        data: JSON text as str or bytes
+
+    Returns:
+        Parsed Python object
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> str:
+    """
+    Serialize an object to a JSON string.
+
+    Args:
+        obj: Object to serialize
+        sort_keys: Emit dict keys in sorted order (e.g. for hashing)
+
+    Returns:
+        str: JSON text
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else None).decode()
+    return json.dumps(obj, sort_keys=sort_keys)
+
+
+def load_config(path: Union[str, os.PathLike]) -> Dict[str, Any]:
+    """
+    Load a JSON config file, reusing the parsed result until the file changes.
+
+    The cache is keyed on the file's modification time and size, so an
+    edited config is picked up on the next call. Each call returns a deep
+    copy of the cached config, so callers may modify it, nested sections
+    included, without affecting later calls.
+
+    Args:
+        path: Path to the JSON config file
+
+    Returns:
+        dict: The parsed config
+    """
+    stat = os.stat(path)
+    return copy.deepcopy(_load_config(os.fspath(path), stat.st_mtime_ns, stat.st_size))
+
+
+@lru_cache(maxsize=16)
+def _load_config(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a config file; the stat fields only serve as cache key."""
+    with open(path, 'rb') as f:
+        return loads(f.read())
@@ -4,15 +4,26 @@ NetMHCIIpan tool wrapper utilities.
 This module provides a centralized way to locate and run the NetMHCIIpan tool.
 """
 
+import logging
+import os
 import subprocess
+import tempfile
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import AbstractSet, Iterable, Iterator, List, Optional, Union
 
 
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
 def find_netmhciipan_path() -> Path:
     """
     Find the NetMHCIIpan executable.
 
+    The lookup is cached for the lifetime of the process, since the binary
+    does not move between calls.
+
     Returns:
         Path: Path to NetMHCIIpan executable
 
@@ -37,8 +48,44 @@ def find_netmhciipan_path() -> Path:
     )
 
 
+def cpu_set_for_slot(slot: int) -> Optional[AbstractSet[int]]:
+    """
+    Pick a single CPU for the given worker slot.
+
+    Slots are spread round-robin over the CPUs this process may run on, so
+    parallel NetMHCIIpan runs each stay on their own core.
+
+    Args:
+        slot: Worker index (e.g. position in a pool of parallel workers)
+
+    Returns:
+        set: CPU set to pin to, or None where affinity is unsupported
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        return None
+    cpus = sorted(os.sched_getaffinity(0))
+    return {cpus[slot % len(cpus)]}
+
+
+def _pin_process(proc: subprocess.Popen, cpus: Optional[AbstractSet[int]]) -> None:
+    """
+    Restrict a freshly started process to the given CPUs.
+
+    The affinity is set from the parent rather than through preexec_fn,
+    which is unsafe when processes are launched from several threads.
+    Processes the wrapper spawns afterwards inherit the mask.
+    """
+    if not cpus:
+        return
+    try:
+        os.sched_setaffinity(proc.pid, cpus)
+    except OSError:
+        # Process already exited or the CPU is not allowed; run unpinned
+        pass
+
+
 def run_netmhciipan(
-    input_file: str,
+    input_file: Optional[str],
     allele: str,
     input_type: str = "peptide",
     context: bool = False,
@@ -46,13 +93,17 @@ def run_netmhciipan(
     sorted_output: bool = False,
     alpha_seq: Optional[str] = None,
     beta_seq: Optional[str] = None,
-    custom_seq: Optional[str] = None
-) -> str:
+    custom_seq: Optional[str] = None,
+    stream: bool = False,
+    cpus: Optional[AbstractSet[int]] = None,
+    stdout_path: Optional[Union[str, Path]] = None,
+    input_text: Optional[str] = None
+) -> Union[str, Iterator[str]]:
     """
     Run NetMHCIIpan with specified parameters.
 
     Args:
-        input_file: Path to input file
+        input_file: Path to input file (ignored when input_text is given)
         allele: MHC allele name
         input_type: "peptide" or "protein"
         context: Enable context-aware prediction
@@ -61,14 +112,25 @@ def run_netmhciipan(
         alpha_seq: Path to alpha chain sequence file
         beta_seq: Path to beta chain sequence file
         custom_seq: Path to custom HLA sequence file
+        stream: Return an iterator over output lines instead of the full text
+        cpus: CPUs to pin the NetMHCIIpan process to (Linux only, see
+            cpu_set_for_slot)
+        stdout_path: Have NetMHCIIpan write its output straight to this file
+            (replaced only once the run succeeds); the text is still returned
+        input_text: Input passed to NetMHCIIpan on stdin (via /dev/stdin)
+            instead of through a file; not supported together with stream
 
     Returns:
-        str: NetMHCIIpan output
+        str: NetMHCIIpan output, or an iterator over its lines if stream is set
 
     Raises:
         subprocess.CalledProcessError: If NetMHCIIpan fails
         FileNotFoundError: If NetMHCIIpan executable not found
+        ValueError: If input_text is combined with stream
     """
+    if stream and input_text is not None:
+        raise ValueError("input_text cannot be combined with stream")
+
     netmhciipan_path = find_netmhciipan_path()
 
     # Build command
@@ -80,8 +142,8 @@ def run_netmhciipan(
     else:  # protein
         cmd.extend(["-inptype", "0"])
 
-    # Add input file
-    cmd.extend(["-f", input_file])
+    # Add input file, or read the input from stdin
+    cmd.extend(["-f", "/dev/stdin" if input_text is not None else input_file])
 
     # Add allele (if not using custom sequences)
     if not (alpha_seq or beta_seq or custom_seq):
@@ -107,13 +169,152 @@ def run_netmhciipan(
     if custom_seq:
         cmd.extend(["-hlaseq", custom_seq])
 
+    # Stream output lines without holding the full text in memory
+    if stream:
+        return _iter_output_lines(cmd, cpus)
+
+    # Let the process write to disk itself instead of piping through Python
+    if stdout_path is not None:
+        return _run_to_file(cmd, Path(stdout_path), cpus, input_text)
+
     # Run NetMHCIIpan
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return result.stdout
-    except subprocess.CalledProcessError as e:
+    with subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE if input_text is not None else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True
+    ) as proc:
+        _pin_process(proc, cpus)
+        stdout, stderr = proc.communicate(input_text)
+
+    if proc.returncode != 0:
         raise subprocess.CalledProcessError(
-            e.returncode,
+            proc.returncode,
             cmd,
-            f"NetMHCIIpan failed: {e.stderr}"
-        )
\ No newline at end of file
+            f"NetMHCIIpan failed: {stderr}"
+        )
+    return stdout
+
+
+def _iter_output_lines(
+    cmd: List[str],
+    cpus: Optional[AbstractSet[int]] = None
+) -> Iterator[str]:
+    """
+    Run a NetMHCIIpan command and yield its stdout line by line.
+
+    stderr is spooled to a temporary file so a chatty process cannot block
+    on a full pipe while stdout is being consumed. The exit status is only
+    checked once the iterator is exhausted; closing it early kills the
+    process (see drain_stream).
+
+    Args:
+        cmd: Full NetMHCIIpan command line
+        cpus: CPUs to pin the process to
+
+    Yields:
+        str: Output lines (including trailing newline)
+
+    Raises:
+        subprocess.CalledProcessError: If NetMHCIIpan exits with an error
+    """
+    with tempfile.TemporaryFile() as stderr_file:
+        proc = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=stderr_file, text=True, bufsize=1
+        )
+        _pin_process(proc, cpus)
+        try:
+            yield from proc.stdout
+        except GeneratorExit:
+            # Consumer stopped early; its status can no longer be checked
+            logger.warning("NetMHCIIpan output abandoned before exit: %s", ' '.join(cmd))
+            proc.kill()
+            raise
+        finally:
+            proc.stdout.close()
+            returncode = proc.wait()
+
+        if returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors='replace')
+            raise subprocess.CalledProcessError(
+                returncode,
+                cmd,
+                f"NetMHCIIpan failed: {stderr}"
+            )
+
+
+def drain_stream(lines: Iterable[str]) -> None:
+    """
+    Consume the rest of a streamed NetMHCIIpan run.
+
+    Parsers stop reading after the section they need; draining the
+    remaining lines lets the process exit on its own, so a failure is
+    raised instead of being hidden by an early close.
+
+    Args:
+        lines: Iterator returned by run_netmhciipan(stream=True)
+
+    Raises:
+        subprocess.CalledProcessError: If NetMHCIIpan exits with an error
+    """
+    for _ in lines:
+        pass
+
+
+def _run_to_file(
+    cmd: List[str],
+    output_path: Path,
+    cpus: Optional[AbstractSet[int]] = None,
+    input_text: Optional[str] = None
+) -> str:
+    """
+    Run a NetMHCIIpan command with its stdout redirected to a file.
+
+    Output goes to a sibling ".part" file which is moved over output_path
+    only after a successful run, so a failed run never leaves a truncated
+    result (or clobbers an earlier one).
+
+    Args:
+        cmd: Full NetMHCIIpan command line
+        output_path: File to receive the output
+        cpus: CPUs to pin the process to
+        input_text: Input to pass on stdin, if any
+
+    Returns:
+        str: NetMHCIIpan output, read back from the written file
+
+    Raises:
+        subprocess.CalledProcessError: If NetMHCIIpan exits with an error
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    part_path = output_path.with_name(output_path.name + ".part")
+
+    try:
+        with open(part_path, 'wb') as out:
+            with subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE if input_text is not None else None,
+                stdout=out,
+                stderr=subprocess.PIPE
+            ) as proc:
+                _pin_process(proc, cpus)
+                _, stderr = proc.communicate(
+                    input_text.encode() if input_text is not None else None
+                )
+
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(
+                proc.returncode,
+                cmd,
+                f"NetMHCIIpan failed: {stderr.decode(errors='replace')}"
+            )
+
+        with open(part_path) as f:
+            output = f.read()
+        os.replace(part_path, output_path)
+        return output
+    finally:
+        if part_path.exists():
+            part_path.unlink()
@@ -0,0 +1,188 @@
+"""
+On-disk cache of raw NetMHCIIpan output.
+
+NetMHCIIpan is deterministic for a given binary, MHC molecule and input, so a
+repeated query can be answered from an earlier run instead of starting the
+tool again. Entries are plain text files named by a SHA-256 of the inputs.
+The cache is bounded by entry count and total size; the least recently used
+entries are pruned first.
+"""
+
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Union
+
+from netmhciipan import find_netmhciipan_path
+from utils import safe_file_cleanup
+
+
+# Cache bounds; once either is exceeded after a store, the least recently
+# used entries are removed
+MAX_ENTRIES = 1000
+MAX_BYTES = 512 * 1024 * 1024
+
+
+@lru_cache(maxsize=1)
+def cache_dir() -> Path:
+    """
+    Locate the cache directory.
+
+    Uses $NETMHCIIPAN_MCP_CACHE_DIR if set, otherwise
+    $XDG_CACHE_HOME/netmhciipan_mcp (~/.cache/netmhciipan_mcp).
+
+    Returns:
+        Path: Cache directory (not necessarily created yet)
+    """
+    override = os.environ.get("NETMHCIIPAN_MCP_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "netmhciipan_mcp"
+
+
+def output_cache_key(input_type: str, input_text: str, *mhc: str) -> str:
+    """
+    Build the cache key for a NetMHCIIpan run.
+
+    The input is hashed in the order given, since NetMHCIIpan reports
+    predictions in input order. The binary's path, modification time and
+    size are part of the key, so upgrading NetMHCIIpan in place does not
+    return stale predictions.
+
+    Args:
+        input_type: "peptide" or "protein"
+        input_text: Exact input passed to NetMHCIIpan
+        *mhc: Strings identifying the MHC molecule, e.g. the allele name or
+            the contents of custom sequence files
+
+    Returns:
+        str: Hex digest identifying the run
+    """
+    binary = find_netmhciipan_path()
+    stat = binary.stat()
+    digest = hashlib.sha256()
+    for part in (str(binary), str(stat.st_mtime_ns), str(stat.st_size), input_type, *mhc, input_text):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: Union[str, os.PathLike]) -> str:
+    """
+    Hash a file's contents, reusing the digest until the file changes.
+
+    Meant for the small MHC sequence files that identify a custom allele:
+    repeated queries against the same chains then skip reading them. The
+    cache is keyed on the file's inode, size and modification and change
+    times; the change time moves on every write and, unlike the
+    modification time, cannot be set back by the writer.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        str: SHA-256 hex digest of the file contents
+    """
+    stat = os.stat(path)
+    return _file_fingerprint(
+        os.fspath(path), stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns
+    )
+
+
+@lru_cache(maxsize=256)
+def _file_fingerprint(path: str, ino: int, size: int, mtime_ns: int, ctime_ns: int) -> str:
+    """Hash a file; the stat fields only serve as cache key."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_cached_output(key: str) -> Optional[str]:
+    """
+    Look up cached NetMHCIIpan output.
+
+    A hit refreshes the entry's modification time, which pruning uses as
+    its last-used time.
+
+    Args:
+        key: Key from output_cache_key
+
+    Returns:
+        str or None: Cached output, or None on a miss
+    """
+    path = cache_dir() / key
+    try:
+        with open(path) as f:
+            output = f.read()
+    except OSError:
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return output
+
+
+def store_cached_output(key: str, output: str) -> None:
+    """
+    Store NetMHCIIpan output in the cache.
+
+    The entry is written to a temporary file and renamed into place, so
+    concurrent readers never see a partial entry. The cache is then pruned
+    back within MAX_ENTRIES and MAX_BYTES. Failures are ignored; the cache
+    is only an optimization.
+
+    Args:
+        key: Key from output_cache_key
+        output: Raw NetMHCIIpan output
+    """
+    directory = cache_dir()
+    temp_path = None
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            mode='w', dir=directory, prefix=f".{key}.", delete=False
+        ) as f:
+            temp_path = f.name
+            f.write(output)
+        os.replace(temp_path, directory / key)
+    except OSError:
+        safe_file_cleanup(temp_path)
+        return
+    _prune(directory)
+
+
+def _prune(directory: Path) -> None:
+    """Remove least recently used entries until the cache is within bounds."""
+    entries = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                # Skip in-flight temporary files (".<key>.<random>")
+                if entry.name.startswith('.') or not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+    except OSError:
+        return
+
+    total_bytes = sum(size for _, size, _ in entries)
+    if len(entries) <= MAX_ENTRIES and total_bytes <= MAX_BYTES:
+        return
+
+    entries.sort()
+    count = len(entries)
+    for _, size, path in entries:
+        if count <= MAX_ENTRIES and total_bytes <= MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        count -= 1
+        total_bytes -= size
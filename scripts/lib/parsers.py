@@ -4,20 +4,278 @@ NetMHCIIpan output parsing utilities.
 This module provides functions to parse and extract information from NetMHCIIpan output.
 """
 
-import re
-from typing import Dict, List, Any
+import heapq
+import sys
+from operator import itemgetter
+from typing import Callable, Dict, List, Any, Iterable, Iterator, Optional, Sequence, Tuple, Union
 
+# Prediction fields in NetMHCIIpan column order
+PREDICTION_FIELDS = (
+    'position', 'mhc', 'peptide', 'core', 'of', 'gp', 'gl', 'ip', 'il',
+    'icore', 'identity', 'score', 'rank', 'exp_bind', 'bind_level'
+)
 
-def parse_netmhciipan_output(output_text: str) -> Dict[str, Any]:
+# Fields read by format_summary_report; parsing only these is enough when
+# the summary is the sole consumer
+SUMMARY_FIELDS = ('position', 'peptide', 'rank')
+
+# Number of columns in a NetMHCIIpan prediction row
+_N_COLUMNS = len(PREDICTION_FIELDS)
+
+# Index of the rank column within a parsed row
+_RANK_INDEX = PREDICTION_FIELDS.index('rank')
+
+# Number of top binders listed in the summary report
+_TOP_BINDER_LIMIT = 5
+
+# Interning for the low-cardinality text columns (allele, sequence identity,
+# binding markers), so repeated values across rows share a single object
+_intern = sys.intern
+
+
+def parse_netmhciipan_output(
+    output_text: Union[str, Iterable[str]],
+    columnar: bool = False,
+    fields: Optional[Sequence[str]] = None,
+    strong_only: bool = False
+) -> Dict[str, Any]:
     """
     Parse NetMHCIIpan output and extract key information.
 
+    Only the first results section is read; use parse_netmhciipan_sections
+    for output covering several alleles.
+
+    Args:
+        output_text: Raw output from NetMHCIIpan, either as a single string
+            or as an iterable of lines (e.g. a streamed process or file)
+        columnar: Return predictions as one list per field instead of one
+            dict per prediction. Much smaller for long protein scans.
+        fields: Prediction fields to keep (default: all of PREDICTION_FIELDS;
+            'rank' is always kept). E.g. SUMMARY_FIELDS when only a summary
+            report is needed.
+        strong_only: Keep only strong binders (rank <= 1%); the summary
+            counts still cover every prediction
+
+    Returns:
+        dict: Parsed results with predictions and summary statistics. By
+        default this holds 'all_predictions', 'strong_binders' and
+        'weak_binders' as lists of dicts; with columnar=True it holds
+        'columns' (field name -> list of values) and 'n' instead.
+    """
+    fields = _select_fields(fields)
+    lines = _iter_lines(output_text)
+    _seek_results_header(lines)
+    return _parse_section(lines, columnar, fields, strong_only)
+
+
+def summarize_netmhciipan_output(
+    output_text: Union[str, Iterable[str]],
+    preview: int = 10,
+    fields: Optional[Sequence[str]] = None,
+    strong_only: bool = False
+) -> Dict[str, Any]:
+    """
+    Summarize NetMHCIIpan output in a single pass without keeping all predictions.
+
+    Only the binder counts, the first `preview` predictions and the best
+    strong/weak binders needed by format_summary_report are retained, so
+    memory stays flat however large the output is. Like
+    parse_netmhciipan_output, only the first results section is read.
+
+    Args:
+        output_text: Raw output from NetMHCIIpan (string or iterable of
+            lines, e.g. an open file)
+        preview: Number of leading predictions to keep
+        fields: Prediction fields to keep (see parse_netmhciipan_output)
+        strong_only: Preview only strong binders (weak binders are then
+            only counted)
+
+    Returns:
+        dict: 'preview' (list of prediction dicts), 'strong_binders' and
+        'weak_binders' (only the top binders of each, best first) and
+        'summary'; can be passed to format_summary_report
+    """
+    fields = _select_fields(fields)
+    rank_index = fields.index('rank')
+    lines = _iter_lines(output_text)
+    _seek_results_header(lines)
+
+    # Bounded max-heaps of (-rank, -index, values): the root is the worst
+    # binder kept so far, and ties go to the earlier prediction
+    strong_heap = []
+    weak_heap = []
+    head = []
+    total = strong = weak = 0
+
+    for index, values in enumerate(_iter_section_fields(lines, fields)):
+        total += 1
+        rank = values[rank_index]
+        if len(head) < preview and (rank <= 1.0 or not strong_only):
+            head.append(values)
+
+        if rank <= 1.0:
+            strong += 1
+            heap = strong_heap
+        elif rank <= 5.0:
+            weak += 1
+            if strong_only:
+                continue
+            heap = weak_heap
+        else:
+            continue
+
+        entry = (-rank, -index, values)
+        if len(heap) < _TOP_BINDER_LIMIT:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    def best_first(heap):
+        return [dict(zip(fields, values)) for _, _, values in sorted(heap, reverse=True)]
+
+    return {
+        'strong_binders': best_first(strong_heap),
+        'weak_binders': best_first(weak_heap),
+        'preview': [dict(zip(fields, values)) for values in head],
+        'summary': _summarize_counts(total, strong, weak)
+    }
+
+
+def parse_netmhciipan_sections(
+    output_text: Union[str, Iterable[str]],
+    columnar: bool = False,
+    fields: Optional[Sequence[str]] = None,
+    strong_only: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Parse every results section of a NetMHCIIpan output.
+
+    NetMHCIIpan run with a comma-separated allele list (-a A1,A2,...) prints
+    one results section per allele, in the order the alleles were given.
+
     Args:
-        output_text: Raw output from NetMHCIIpan
+        output_text: Raw output from NetMHCIIpan (string or iterable of lines)
+        columnar: Return each section in columnar form
+        fields: Prediction fields to keep (see parse_netmhciipan_output)
+        strong_only: Keep only strong binders (see parse_netmhciipan_output)
 
     Returns:
-        dict: Parsed results with predictions and summary statistics
+        list: One parsed result per section, in output order
+    """
+    fields = _select_fields(fields)
+    lines = _iter_lines(output_text)
+    sections = []
+    while _seek_results_header(lines):
+        sections.append(_parse_section(lines, columnar, fields, strong_only))
+    return sections
+
+
+def _parse_section(
+    lines: Iterator[str],
+    columnar: bool,
+    fields: Tuple[str, ...],
+    strong_only: bool = False
+) -> Dict[str, Any]:
+    """
+    Parse the results section the line iterator is positioned in.
+
+    With strong_only, rows are filtered on rank as they are parsed, so
+    weak and non-binders never become dicts or column entries; they are
+    only counted for the summary.
     """
+    rows = _iter_section_fields(lines, fields)
+    if not strong_only:
+        return _build_results(rows, columnar, fields)
+
+    counts = [0, 0, 0]
+    results = _build_results(_strong_rows(rows, fields.index('rank'), counts), columnar, fields)
+    results['summary'] = _summarize_counts(*counts)
+    return results
+
+
+def _strong_rows(
+    rows: Iterable[Tuple[Any, ...]],
+    rank_index: int,
+    counts: List[int]
+) -> Iterator[Tuple[Any, ...]]:
+    """Yield only strong-binder rows, tallying all rows into counts [total, strong, weak]."""
+    for values in rows:
+        counts[0] += 1
+        rank = values[rank_index]
+        if rank <= 1.0:
+            counts[1] += 1
+            yield values
+        elif rank <= 5.0:
+            counts[2] += 1
+
+
+def _select_fields(fields: Optional[Sequence[str]]) -> Tuple[str, ...]:
+    """
+    Normalize a requested field subset to PREDICTION_FIELDS order.
+
+    Args:
+        fields: Requested field names, or None for all fields
+
+    Returns:
+        tuple: Field names in column order, always including 'rank'
+
+    Raises:
+        ValueError: If an unknown field name is requested
+    """
+    if fields is None:
+        return PREDICTION_FIELDS
+
+    unknown = set(fields).difference(PREDICTION_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown prediction field(s): {', '.join(sorted(unknown))}")
+
+    wanted = set(fields) | {'rank'}
+    return tuple(field for field in PREDICTION_FIELDS if field in wanted)
+
+
+def _iter_lines(output_text: Union[str, Iterable[str]]) -> Iterator[str]:
+    """Return an iterator over output lines from a string or line iterable."""
+    if isinstance(output_text, str):
+        return _split_lines(output_text)
+    return iter(output_text)
+
+
+def _split_lines(text: str) -> Iterator[str]:
+    """
+    Lazily yield the '\n'-separated lines of a string.
+
+    Unlike text.split('\n'), this never holds a list of every line of a
+    large output alongside the text itself.
+    """
+    find = text.find
+    start = 0
+    end = find('\n')
+    while end >= 0:
+        yield text[start:end]
+        start = end + 1
+        end = find('\n', start)
+    yield text[start:]
+
+
+def _build_results(
+    rows: Iterable[Tuple[Any, ...]],
+    columnar: bool,
+    fields: Tuple[str, ...] = PREDICTION_FIELDS
+) -> Dict[str, Any]:
+    """
+    Collect parsed prediction rows into a results dict.
+
+    Args:
+        rows: Parsed field tuples in `fields` order
+        columnar: Build the struct-of-arrays layout instead of row dicts
+        fields: Names of the fields in each row
+
+    Returns:
+        dict: Parsed results with summary statistics
+    """
+    if columnar:
+        return _build_columns(rows, fields)
+
     results = {
         'strong_binders': [],
         'weak_binders': [],
@@ -25,79 +283,309 @@ def parse_netmhciipan_output(output_text: str) -> Dict[str, Any]:
         'summary': {}
     }
 
-    lines = output_text.split('\n')
-    in_results_section = False
+    for values in rows:
+        prediction = dict(zip(fields, values))
+        results['all_predictions'].append(prediction)
+
+        # Classify by binding strength
+        rank = prediction['rank']
+        if rank <= 1.0:  # Strong binder
+            results['strong_binders'].append(prediction)
+        elif rank <= 5.0:  # Weak binder
+            results['weak_binders'].append(prediction)
+
+    # Add summary statistics
+    results['summary'] = _summarize_counts(
+        len(results['all_predictions']),
+        len(results['strong_binders']),
+        len(results['weak_binders'])
+    )
+
+    return results
+
+
+def _build_columns(
+    rows: Iterable[Tuple[Any, ...]],
+    fields: Tuple[str, ...] = PREDICTION_FIELDS
+) -> Dict[str, Any]:
+    """
+    Collect parsed prediction rows into a struct-of-arrays layout.
+
+    Rows are transposed in one zip(*rows) call and binders are counted over
+    the finished rank column, rather than appending field by field per row.
+
+    Args:
+        rows: Parsed field tuples in `fields` order
+        fields: Names of the fields in each row
+
+    Returns:
+        dict: 'columns' mapping each field to a list of values, 'n' rows,
+        and summary statistics
+    """
+    rows = list(rows)
+    n = len(rows)
+    if n:
+        columns = dict(zip(fields, map(list, zip(*rows))))
+    else:
+        columns = {field: [] for field in fields}
+    del rows
 
+    ranks = columns['rank']
+    strong = sum(rank <= 1.0 for rank in ranks)
+    weak = sum(1.0 < rank <= 5.0 for rank in ranks)
+
+    return {
+        'columns': columns,
+        'n': n,
+        'summary': _summarize_counts(n, strong, weak)
+    }
+
+
+def _summarize_counts(total: int, strong: int, weak: int) -> Dict[str, int]:
+    """Build the summary statistics dict from binder counts."""
+    return {
+        'total_predictions': total,
+        'strong_binders_count': strong,
+        'weak_binders_count': weak,
+        'non_binders_count': total - strong - weak
+    }
+
+
+def _seek_results_header(lines: Iterator[str]) -> bool:
+    """
+    Advance past the next results-section header line.
+
+    Args:
+        lines: Iterator over output lines
+
+    Returns:
+        bool: True if a header was found, False if the output is exhausted
+    """
     for line in lines:
-        # Detect start of results section
         if line.startswith(' Pos ') and 'MHC' in line and 'Peptide' in line:
-            in_results_section = True
-            continue
+            return True
+    return False
 
-        # Parse prediction lines
-        if in_results_section and line.strip() and not line.startswith('-'):
-            if line.startswith('Number of'):
-                break
 
-            # Extract prediction data
-            prediction = parse_prediction_line(line)
-            if prediction:
-                results['all_predictions'].append(prediction)
+def _iter_section_fields(
+    lines: Iterator[str],
+    fields: Tuple[str, ...] = PREDICTION_FIELDS
+) -> Iterator[Tuple[Any, ...]]:
+    """
+    Yield the parsed fields of each prediction row in the current section.
 
-                # Classify by binding strength
-                rank = prediction.get('rank', 100.0)
-                if rank <= 1.0:  # Strong binder
-                    results['strong_binders'].append(prediction)
-                elif rank <= 5.0:  # Weak binder
-                    results['weak_binders'].append(prediction)
+    Stops at the section's closing "Number of ..." line, leaving the
+    iterator positioned for the next section.
 
-    # Add summary statistics
-    results['summary'] = {
-        'total_predictions': len(results['all_predictions']),
-        'strong_binders_count': len(results['strong_binders']),
-        'weak_binders_count': len(results['weak_binders']),
-        'non_binders_count': len(results['all_predictions']) - len(results['strong_binders']) - len(results['weak_binders'])
-    }
+    Args:
+        lines: Iterator over output lines, positioned after a header
+        fields: Fields to extract, in PREDICTION_FIELDS order
 
-    return results
+    Yields:
+        tuple: Converted values in `fields` order
+    """
+    for line in lines:
+        if line.startswith('Number of'):
+            break
+        if line.startswith('-'):
+            continue
+
+        # Blank lines need no separate check: they split into too few
+        # fields and are rejected by the row parser
+        values = _parse_prediction_fields(line, fields)
+        if values:
+            yield values
 
 
-def parse_prediction_line(line: str) -> Dict[str, Any]:
+def parse_prediction_line(line: str, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
     """
     Parse a single prediction line from NetMHCIIpan output.
 
     Args:
         line: Single line from results section
+        fields: Prediction fields to keep (default: all; 'rank' is always kept)
 
     Returns:
         dict: Parsed prediction data or None if parsing fails
     """
+    fields = _select_fields(fields)
+    values = _parse_prediction_fields(line, fields)
+    if values is None:
+        return None
+    return dict(zip(fields, values))
+
+
+def _parse_prediction_fields(
+    line: str,
+    fields: Tuple[str, ...] = PREDICTION_FIELDS
+) -> Optional[Tuple[Any, ...]]:
+    """
+    Split and convert a prediction line into a tuple of field values.
+
+    Args:
+        line: Single line from results section
+        fields: Fields to extract, in PREDICTION_FIELDS order
+
+    Returns:
+        tuple: Values in `fields` order, or None if parsing fails
+    """
+    parts = line.split()
+    n_parts = len(parts)
+    if n_parts < 10:
+        return None
+
+    key = (min(n_parts, _N_COLUMNS), fields)
+    row_parser = _ROW_PARSERS.get(key) or _make_row_parser(*key)
     try:
-        parts = line.strip().split()
-        if len(parts) < 10:
-            return None
-
-        return {
-            'position': int(parts[0]),
-            'mhc': parts[1],
-            'peptide': parts[2],
-            'core': parts[3] if len(parts) > 3 else "",
-            'of': parts[4] if len(parts) > 4 else "",
-            'gp': parts[5] if len(parts) > 5 else "",
-            'gl': parts[6] if len(parts) > 6 else "",
-            'ip': parts[7] if len(parts) > 7 else "",
-            'il': parts[8] if len(parts) > 8 else "",
-            'icore': parts[9] if len(parts) > 9 else "",
-            'identity': parts[10] if len(parts) > 10 else "",
-            'score': float(parts[11]) if len(parts) > 11 and parts[11] != 'NA' else None,
-            'rank': float(parts[12]) if len(parts) > 12 and parts[12] != 'NA' else 100.0,
-            'exp_bind': parts[13] if len(parts) > 13 else "",
-            'bind_level': parts[14] if len(parts) > 14 else ""
-        }
-    except (ValueError, IndexError):
+        return row_parser(parts)
+    except ValueError:
         return None
 
 
+# Row converters specialized per (number of present columns, field subset)
+_ROW_PARSERS: Dict[Tuple[int, Tuple[str, ...]], Callable[[List[str]], Tuple[Any, ...]]] = {}
+
+# Generated conversion per field: (expression template, value if the column
+# is missing). Fields not listed are kept as the raw string.
+_FIELD_CONVERSIONS = {
+    'position': ('int({})', "''"),
+    'mhc': ('_intern({})', "''"),
+    'identity': ('_intern({})', "''"),
+    'score': ("(float({0}) if {0} != 'NA' else None)", 'None'),
+    'rank': ("(float({0}) if {0} != 'NA' else 100.0)", '100.0'),
+    'exp_bind': ('_intern({})', "''"),
+    'bind_level': ('_intern({})', "''"),
+}
+
+# Conversions that can reject a row; they run even when their field is not
+# kept, so a field subset accepts exactly the same rows as a full parse
+_VALIDATING_FIELDS = ('position', 'score')
+
+
+def _make_row_parser(
+    n_present: int,
+    fields: Tuple[str, ...] = PREDICTION_FIELDS
+) -> Callable[[List[str]], Tuple[Any, ...]]:
+    """
+    Generate and cache a row converter for rows with n_present columns.
+
+    The generated function indexes exactly the columns that exist and uses
+    constants for the missing trailing ones, so the per-row work has no
+    padding, length checks or empty-field tests. Fields outside `fields` are
+    skipped entirely, apart from the checks that decide if a row is valid.
+
+    Args:
+        n_present: Number of whitespace-separated fields (capped at 15)
+        fields: Fields to return, in PREDICTION_FIELDS order
+
+    Returns:
+        callable: Function mapping the split fields to a tuple in `fields` order
+    """
+    def expression(field: str) -> str:
+        index = PREDICTION_FIELDS.index(field)
+        convert, missing = _FIELD_CONVERSIONS.get(field, ('{}', "''"))
+        if index >= n_present:
+            return missing
+        return convert.format(f'parts[{index}]')
+
+    checks = [
+        f"    {expression(field)}\n"
+        for field in _VALIDATING_FIELDS
+        if field not in fields and PREDICTION_FIELDS.index(field) < n_present
+    ]
+    values = ', '.join(expression(field) for field in fields)
+    source = f"def _parse_row(parts):\n{''.join(checks)}    return ({values},)\n"
+
+    namespace = {'_intern': _intern}
+    exec(source, namespace)
+    row_parser = _ROW_PARSERS[n_present, fields] = namespace['_parse_row']
+    return row_parser
+
+
+def prediction_row(results: Dict[str, Any], index: int) -> Dict[str, Any]:
+    """
+    Materialize a single prediction of a columnar result as a dict.
+
+    Args:
+        results: Columnar results from parse_netmhciipan_output(columnar=True)
+        index: Row index (0 <= index < results['n'])
+
+    Returns:
+        dict: The prediction, keyed like the row-oriented 'all_predictions'
+        (only the parsed fields, if a field subset was requested)
+    """
+    return {field: values[index] for field, values in results['columns'].items()}
+
+
+def expand_peptide_results(results: Dict[str, Any], peptides: Sequence[str]) -> Dict[str, Any]:
+    """
+    Map the results of a run on distinct peptides back onto a list with repeats.
+
+    Every entry of `peptides` gets the prediction for that peptide,
+    renumbered to its position in the list, so a deduplicated run reads as
+    if each copy had been scored. Peptides without a prediction are skipped.
+
+    Args:
+        results: Row-oriented results of a peptide run (one prediction per
+            distinct peptide, including the position and peptide fields)
+        peptides: Peptides in the caller's order, possibly with repeats
+
+    Returns:
+        dict: Parsed results with one prediction per listed peptide
+    """
+    predictions = results['all_predictions']
+    fields = tuple(predictions[0]) if predictions else PREDICTION_FIELDS
+
+    by_peptide = {}
+    for prediction in predictions:
+        by_peptide.setdefault(prediction['peptide'], prediction)
+
+    rows = (
+        tuple({**by_peptide[peptide], 'position': position}.values())
+        for position, peptide in enumerate(peptides, 1)
+        if peptide in by_peptide
+    )
+    return _build_results(rows, False, fields)
+
+
+def _top_binders(
+    results: Dict[str, Any], low: float, high: float, limit: int = _TOP_BINDER_LIMIT
+) -> List[Dict[str, Any]]:
+    """
+    Return the `limit` best-ranked binders with low < rank <= high.
+
+    Selection is a bounded heap over the candidates (O(N log limit)), so the
+    binders never need a full sort. Works on both the row-oriented and the
+    columnar parse results; ties keep output order.
+    """
+    if 'columns' in results:
+        ranks = results['columns'].get('rank', [])
+        candidates = (i for i, rank in enumerate(ranks) if low < rank <= high)
+        top = heapq.nsmallest(limit, candidates, key=ranks.__getitem__)
+        return [prediction_row(results, i) for i in top]
+
+    key = 'strong_binders' if high <= 1.0 else 'weak_binders'
+    return heapq.nsmallest(limit, results[key], key=itemgetter('rank'))
+
+
+# Summary report layout; the placeholders are the keys of results['summary']
+# plus the rendered top-binder section
+_SUMMARY_TEMPLATE = (
+    "=" * 80 + "\n"
+    "NetMHCIIpan Prediction Summary\n"
+    + "=" * 80 + "\n"
+    "Total predictions: {total_predictions}\n"
+    "Strong binders (≤1% rank): {strong_binders_count}\n"
+    "Weak binders (1-5% rank): {weak_binders_count}\n"
+    "Non-binders (>5% rank): {non_binders_count}\n"
+    "{top_binders}"
+)
+
+_TOP_BINDERS_HEADER = "\nTop {} Binders:\n" + "-" * 40 + "\n"
+
+_BINDER_LINE = "  {}. {} (pos {}, rank {:.3f}%)"
+
+
 def format_summary_report(results: Dict[str, Any]) -> str:
     """
     Format a summary report from parsed results.
@@ -108,42 +596,18 @@ def format_summary_report(results: Dict[str, Any]) -> str:
     Returns:
         str: Formatted summary report
     """
-    summary = results['summary']
-    strong_binders = results['strong_binders']
-    weak_binders = results['weak_binders']
-
-    report = [
-        "="*80,
-        "NetMHCIIpan Prediction Summary",
-        "="*80,
-        f"Total predictions: {summary['total_predictions']}",
-        f"Strong binders (≤1% rank): {summary['strong_binders_count']}",
-        f"Weak binders (1-5% rank): {summary['weak_binders_count']}",
-        f"Non-binders (>5% rank): {summary['non_binders_count']}",
-        ""
-    ]
+    binders = _top_binders(results, float('-inf'), 1.0)
+    if binders:
+        kind, tail = 'Strong', "\n"
+    else:
+        binders = _top_binders(results, 1.0, 5.0)
+        kind, tail = 'Weak', ""
+
+    top_binders = ""
+    if binders:
+        top_binders = _TOP_BINDERS_HEADER.format(kind) + '\n'.join(
+            _BINDER_LINE.format(i, binder['peptide'], binder['position'], binder['rank'])
+            for i, binder in enumerate(binders, 1)
+        ) + tail
 
-    if strong_binders:
-        report.extend([
-            "Top Strong Binders:",
-            "-" * 40
-        ])
-        for i, binder in enumerate(strong_binders[:5]):
-            report.append(
-                f"  {i+1}. {binder['peptide']} "
-                f"(pos {binder['position']}, rank {binder['rank']:.3f}%)"
-            )
-        report.append("")
-
-    if weak_binders and not strong_binders:
-        report.extend([
-            "Top Weak Binders:",
-            "-" * 40
-        ])
-        for i, binder in enumerate(weak_binders[:5]):
-            report.append(
-                f"  {i+1}. {binder['peptide']} "
-                f"(pos {binder['position']}, rank {binder['rank']:.3f}%)"
-            )
-
-    return '\n'.join(report)
\ No newline at end of file
+    return _SUMMARY_TEMPLATE.format_map({**results['summary'], 'top_binders': top_binders})
@@ -6,8 +6,53 @@ These functions are extracted and simplified from the use case scripts to avoid
 
 import os
 import tempfile
+from functools import lru_cache
 from pathlib import Path
-from typing import Union, List, Optional
+from typing import IO, Union, List, Optional
+
+
+@lru_cache(maxsize=1)
+def _temp_dir() -> Optional[str]:
+    """
+    Pick the directory for temporary input files.
+
+    Prefers /dev/shm (tmpfs) when available so that repeated NetMHCIIpan
+    reads of the same input are served from memory instead of disk.
+
+    Returns:
+        str or None: /dev/shm if usable, otherwise None (system temp dir)
+    """
+    shm = "/dev/shm"
+    if os.path.isdir(shm) and os.access(shm, os.W_OK | os.X_OK):
+        return shm
+    return None
+
+
+def format_peptide_input(peptides: List[str]) -> str:
+    """
+    Format peptide sequences as NetMHCIIpan peptide input.
+
+    Args:
+        peptides: List of peptide sequences
+
+    Returns:
+        str: One "<peptide> 0.000" line per peptide
+    """
+    return ''.join([f"{peptide} 0.000\n" for peptide in peptides])
+
+
+def format_fasta_input(sequence: str, seq_name: str = "protein_seq") -> str:
+    """
+    Format a protein sequence as a single FASTA record.
+
+    Args:
+        sequence: Protein sequence string
+        seq_name: Sequence name for FASTA header
+
+    Returns:
+        str: FASTA text
+    """
+    return f">{seq_name}\n{sequence}\n"
 
 
 def create_temp_peptide_file(peptides: List[str]) -> str:
@@ -20,9 +65,8 @@ def create_temp_peptide_file(peptides: List[str]) -> str:
     Returns:
         str: Path to temporary file
     """
-    temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.pep')
-    for peptide in peptides:
-        temp_file.write(f"{peptide} 0.000\n")
+    temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.pep', dir=_temp_dir())
+    temp_file.write(format_peptide_input(peptides))
     temp_file.close()
     return temp_file.name
 
@@ -38,8 +82,8 @@ def create_temp_fasta_file(sequence: str, seq_name: str = "protein_seq") -> str:
     Returns:
         str: Path to temporary file
     """
-    temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.fsa')
-    temp_file.write(f">{seq_name}\n{sequence}\n")
+    temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.fsa', dir=_temp_dir())
+    temp_file.write(format_fasta_input(sequence, seq_name))
     temp_file.close()
     return temp_file.name
 
@@ -51,11 +95,12 @@ def safe_file_cleanup(file_path: Optional[str]) -> None:
     Args:
         file_path: Path to file to remove (can be None)
     """
-    if file_path and os.path.exists(file_path):
-        try:
-            os.unlink(file_path)
-        except OSError:
-            pass  # Ignore cleanup errors
+    if not file_path:
+        return
+    try:
+        os.unlink(file_path)
+    except OSError:
+        pass  # Already gone, or not removable; ignore cleanup errors
 
 
 def validate_input_file(file_path: Union[str, Path]) -> Path:
@@ -77,6 +122,29 @@ def validate_input_file(file_path: Union[str, Path]) -> Path:
     return path
 
 
+def open_for_streaming(file_path: Union[str, Path]) -> IO[str]:
+    """
+    Open a (possibly very large) text file for a single sequential pass.
+
+    Reads go through a 1 MiB buffer, and the kernel is told the file will
+    be read front to back so it can read ahead more aggressively (where
+    posix_fadvise is available).
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Open text file object (use as a context manager)
+    """
+    f = open(file_path, buffering=1 << 20)
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass  # Advisory only
+    return f
+
+
 def save_output(content: str, output_file: Union[str, Path]) -> None:
     """
     Save content to output file.
@@ -88,5 +156,7 @@ def save_output(content: str, output_file: Union[str, Path]) -> None:
     output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, 'w') as f:
-        f.write(content)
\ No newline at end of file
+    # Encode once and hand the bytes over in a single write, bypassing the
+    # text layer (a large write skips the buffer and goes straight to the file)
+    with open(output_path, 'wb') as f:
+        f.write(content.encode('utf-8'))
\ No newline at end of file
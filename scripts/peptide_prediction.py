@@ -19,16 +19,21 @@ Example:
 # ==============================================================================
 import argparse
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Union, Optional, Dict, Any, List
-import json
+from typing import Union, Optional, Dict, Any, List, Sequence
 
-# Add the lib directory to the path for our utilities
-sys.path.insert(0, str(Path(__file__).parent / "lib"))
+# Add the lib directory to the path for our utilities (only once, since the
+# server imports several scripts into the same process)
+_LIB_DIR = str(Path(__file__).parent / "lib")
+if _LIB_DIR not in sys.path:
+    sys.path.insert(0, _LIB_DIR)
 
-from utils import create_temp_peptide_file, validate_input_file, save_output, safe_file_cleanup
+from utils import create_temp_peptide_file, format_peptide_input, validate_input_file, safe_file_cleanup, save_output
 from netmhciipan import run_netmhciipan
-from parsers import parse_netmhciipan_output, format_summary_report
+from parsers import parse_netmhciipan_output, format_summary_report, SUMMARY_FIELDS
+from jsonio import load_config
+from outputcache import output_cache_key, load_cached_output, store_cached_output
 
 # ==============================================================================
 # Configuration
@@ -37,7 +42,9 @@ DEFAULT_CONFIG = {
     "allele": "DRB1_0101",
     "input_type": "peptide",
     "output_format": "text",
-    "verbose": True
+    "verbose": True,
+    "stdin_input": False,
+    "cache": True
 }
 
 # ==============================================================================
@@ -49,6 +56,8 @@ def run_peptide_prediction(
     allele: str = "DRB1_0101",
     output_file: Optional[Union[str, Path]] = None,
     config: Optional[Dict[str, Any]] = None,
+    parse: bool = True,
+    fields: Optional[Sequence[str]] = None,
     **kwargs
 ) -> Dict[str, Any]:
     """
@@ -60,11 +69,16 @@ def run_peptide_prediction(
         allele: MHC allele for prediction
         output_file: Path to save output (optional)
         config: Configuration dict (uses DEFAULT_CONFIG if not provided)
+        parse: Parse the predictions; when False, 'result' is None (e.g.
+            when only the raw output file is wanted)
+        fields: Prediction fields to parse (default: all), e.g.
+            SUMMARY_FIELDS when only a summary report is needed
         **kwargs: Override specific config parameters
 
     Returns:
         Dict containing:
-            - result: Main computation result (parsed predictions)
+            - result: Main computation result (parsed predictions, or None
+              if parse is False)
             - raw_output: Raw NetMHCIIpan output text
             - output_file: Path to output file (if saved)
             - metadata: Execution metadata
@@ -89,29 +103,48 @@ def run_peptide_prediction(
         raise ValueError("Cannot specify both input_file and peptides")
 
     temp_file = None
+    input_text = None
     try:
-        # Prepare input file
-        if peptides:
-            temp_file = create_temp_peptide_file(peptides)
-            final_input_file = temp_file
+        # Reuse the output of an earlier run on the same input, if cached
+        cache_key = None
+        raw_output = None
+        if final_config["cache"]:
+            cache_input = (format_peptide_input(peptides) if peptides
+                           else validate_input_file(input_file).read_text())
+            cache_key = output_cache_key("peptide", cache_input, allele)
+            raw_output = load_cached_output(cache_key)
+
+        if raw_output is not None:
+            if output_file:
+                save_output(raw_output, output_file)
         else:
-            final_input_file = str(validate_input_file(input_file))
-
-        # Run NetMHCIIpan
-        raw_output = run_netmhciipan(
-            input_file=final_input_file,
-            allele=allele,
-            input_type="peptide"
-        )
-
-        # Parse results
-        parsed_results = parse_netmhciipan_output(raw_output)
-
-        # Save output if requested
-        output_path = None
-        if output_file:
-            output_path = Path(output_file)
-            save_output(raw_output, output_path)
+            # Prepare input: inline peptides are either piped to NetMHCIIpan
+            # on stdin or, by default, written to a temporary file
+            if peptides and final_config["stdin_input"]:
+                input_text = format_peptide_input(peptides)
+                final_input_file = None
+            elif peptides:
+                temp_file = create_temp_peptide_file(peptides)
+                final_input_file = temp_file
+            else:
+                final_input_file = str(validate_input_file(input_file))
+
+            # Run NetMHCIIpan
+            raw_output = run_netmhciipan(
+                input_file=final_input_file,
+                allele=allele,
+                input_type="peptide",
+                stdout_path=output_file,
+                input_text=input_text
+            )
+            if cache_key:
+                store_cached_output(cache_key, raw_output)
+
+        # Parse results, unless the caller only wants the raw output
+        parsed_results = parse_netmhciipan_output(raw_output, fields=fields) if parse else None
+
+        # NetMHCIIpan has already written the output file, if one was requested
+        output_path = Path(output_file) if output_file else None
 
         return {
             "result": parsed_results,
@@ -133,7 +166,9 @@ def run_peptide_prediction(
 # ==============================================================================
 # CLI Interface
 # ==============================================================================
-def main():
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser (once per process)."""
     parser = argparse.ArgumentParser(
         description=__doc__,
         formatter_class=argparse.RawDescriptionHelpFormatter
@@ -172,15 +207,26 @@ def main():
         action='store_true',
         help='Show full NetMHCIIpan output'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always run NetMHCIIpan instead of reusing cached output'
+    )
+
+    return parser
 
+
+def main():
+    parser = _build_parser()
     args = parser.parse_args()
 
     try:
         # Load config if provided
         config = None
         if args.config:
-            with open(args.config) as f:
-                config = json.load(f)
+            config = load_config(args.config)
+        if args.no_cache:
+            config = {**(config or {}), "cache": False}
 
         # Prepare peptides list
         peptides = None
@@ -193,7 +239,9 @@ def main():
             peptides=peptides,
             allele=args.allele,
             output_file=args.output,
-            config=config
+            config=config,
+            parse=args.summary,
+            fields=SUMMARY_FIELDS
         )
 
         # Print summary if requested
@@ -19,16 +19,20 @@ Example:
 # ==============================================================================
 import argparse
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Union, Optional, Dict, Any
-import json
+from typing import Union, Optional, Dict, Any, Sequence
 
-# Add the lib directory to the path for our utilities
-sys.path.insert(0, str(Path(__file__).parent / "lib"))
+# Add the lib directory to the path for our utilities (only once, since the
+# server imports several scripts into the same process)
+_LIB_DIR = str(Path(__file__).parent / "lib")
+if _LIB_DIR not in sys.path:
+    sys.path.insert(0, _LIB_DIR)
 
-from utils import create_temp_fasta_file, validate_input_file, save_output, safe_file_cleanup
+from utils import create_temp_fasta_file, format_fasta_input, validate_input_file, safe_file_cleanup
 from netmhciipan import run_netmhciipan
-from parsers import parse_netmhciipan_output, format_summary_report
+from parsers import parse_netmhciipan_output, format_summary_report, SUMMARY_FIELDS
+from jsonio import load_config
 
 # ==============================================================================
 # Configuration
@@ -39,7 +43,8 @@ DEFAULT_CONFIG = {
     "context": False,
     "terminal_anchor": False,
     "sorted_output": False,
-    "output_format": "text"
+    "output_format": "text",
+    "stdin_input": False
 }
 
 # ==============================================================================
@@ -54,6 +59,8 @@ def run_protein_analysis(
     sorted_output: bool = False,
     output_file: Optional[Union[str, Path]] = None,
     config: Optional[Dict[str, Any]] = None,
+    parse: bool = True,
+    fields: Optional[Sequence[str]] = None,
     **kwargs
 ) -> Dict[str, Any]:
     """
@@ -68,11 +75,16 @@ def run_protein_analysis(
         sorted_output: Sort results by binding affinity
         output_file: Path to save output (optional)
         config: Configuration dict (uses DEFAULT_CONFIG if not provided)
+        parse: Parse the predictions; when False, 'result' is None (e.g.
+            when only the raw output file is wanted)
+        fields: Prediction fields to parse (default: all), e.g.
+            SUMMARY_FIELDS when only a summary report is needed
         **kwargs: Override specific config parameters
 
     Returns:
         Dict containing:
-            - result: Main computation result (parsed predictions)
+            - result: Main computation result (parsed predictions, or None
+              if parse is False)
             - raw_output: Raw NetMHCIIpan output text
             - output_file: Path to output file (if saved)
             - metadata: Execution metadata
@@ -101,9 +113,14 @@ def run_protein_analysis(
         raise ValueError("Cannot specify both input_file and protein_sequence")
 
     temp_file = None
+    input_text = None
     try:
-        # Prepare input file
-        if protein_sequence:
+        # Prepare input: an inline sequence is either piped to NetMHCIIpan on
+        # stdin or, by default, written to a temporary FASTA file
+        if protein_sequence and final_config["stdin_input"]:
+            input_text = format_fasta_input(protein_sequence)
+            final_input_file = None
+        elif protein_sequence:
             temp_file = create_temp_fasta_file(protein_sequence)
             final_input_file = temp_file
         else:
@@ -116,17 +133,16 @@ def run_protein_analysis(
             input_type="protein",
             context=context,
             terminal_anchor=terminal_anchor,
-            sorted_output=sorted_output
+            sorted_output=sorted_output,
+            stdout_path=output_file,
+            input_text=input_text
         )
 
-        # Parse results
-        parsed_results = parse_netmhciipan_output(raw_output)
+        # Parse results, unless the caller only wants the raw output
+        parsed_results = parse_netmhciipan_output(raw_output, fields=fields) if parse else None
 
-        # Save output if requested
-        output_path = None
-        if output_file:
-            output_path = Path(output_file)
-            save_output(raw_output, output_path)
+        # NetMHCIIpan has already written the output file, if one was requested
+        output_path = Path(output_file) if output_file else None
 
         return {
             "result": parsed_results,
@@ -151,7 +167,9 @@ def run_protein_analysis(
 # ==============================================================================
 # CLI Interface
 # ==============================================================================
-def main():
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser (once per process)."""
     parser = argparse.ArgumentParser(
         description=__doc__,
         formatter_class=argparse.RawDescriptionHelpFormatter
@@ -206,14 +224,18 @@ def main():
         help='Show full NetMHCIIpan output'
     )
 
+    return parser
+
+
+def main():
+    parser = _build_parser()
     args = parser.parse_args()
 
     try:
         # Load config if provided
         config = None
         if args.config:
-            with open(args.config) as f:
-                config = json.load(f)
+            config = load_config(args.config)
 
         # Run analysis
         result = run_protein_analysis(
@@ -224,7 +246,9 @@ def main():
             terminal_anchor=args.terminal_anchor,
             sorted_output=args.sorted,
             output_file=args.output,
-            config=config
+            config=config,
+            parse=args.summary,
+            fields=SUMMARY_FIELDS
         )
 
         # Print summary if requested
@@ -5,19 +5,46 @@ Provides both synchronous and asynchronous (submit) APIs for NetMHCIIpan tools.
 
 from fastmcp import FastMCP
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Set
+import asyncio
+import hashlib
+import os
 import sys
+import uuid
 
 # Setup paths
 SCRIPT_DIR = Path(__file__).parent.resolve()
 MCP_ROOT = SCRIPT_DIR.parent
 SCRIPTS_DIR = MCP_ROOT / "scripts"
+LIB_DIR = SCRIPTS_DIR / "lib"
 sys.path.insert(0, str(SCRIPT_DIR))
 sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(LIB_DIR))
+
+# Scripts run by the submit tools
+PEPTIDE_SCRIPT = str(SCRIPTS_DIR / "peptide_prediction.py")
+PROTEIN_SCRIPT = str(SCRIPTS_DIR / "protein_analysis.py")
+CUSTOM_SCRIPT = str(SCRIPTS_DIR / "custom_allele_prediction.py")
+BATCH_SCRIPT = str(SCRIPTS_DIR / "batch_multi_allele.py")
 
 from jobs.manager import job_manager
 from loguru import logger
 
+# Script entry points and parsers, imported once rather than per tool call
+from peptide_prediction import run_peptide_prediction
+from protein_analysis import run_protein_analysis
+from custom_allele_prediction import run_custom_allele_prediction
+from batch_multi_allele import run_batch_multi_allele, save_excel_output
+from parsers import (
+    expand_peptide_results,
+    format_summary_report,
+    parse_netmhciipan_sections,
+    summarize_netmhciipan_output,
+)
+from jsonio import dumps
+from outputcache import file_fingerprint
+from utils import open_for_streaming
+
 # Create MCP server
 mcp = FastMCP("netMHCIIpan-4.3")
 
@@ -31,11 +58,15 @@ def get_job_status(job_id: str) -> dict:
     Get the status of a submitted job.
 
     Args:
-        job_id: The job ID returned from a submit_* function
+        job_id: The job ID returned from a submit_* function (a job group
+            ID from submit_large_peptide_screening reports the group's
+            aggregate status)
 
     Returns:
         Dictionary with job status, timestamps, and any errors
     """
+    if job_id in _job_groups:
+        return _job_group_status(job_id)
     return job_manager.get_job_status(job_id)
 
 @mcp.tool()
@@ -44,11 +75,18 @@ def get_job_result(job_id: str) -> dict:
     Get the results of a completed job.
 
     Args:
-        job_id: The job ID of a completed job
+        job_id: The job ID of a completed job (or a job group ID, giving
+            the result of each job in the group)
 
     Returns:
         Dictionary with the job results or error if not completed
     """
+    if job_id in _job_groups:
+        return {
+            "status": _job_group_status(job_id)["status"],
+            "job_id": job_id,
+            "results": {child: job_manager.get_job_result(child) for child in _job_groups[job_id]}
+        }
     return job_manager.get_job_result(job_id)
 
 @mcp.tool()
@@ -71,13 +109,36 @@ def cancel_job(job_id: str) -> dict:
     Cancel a running job.
 
     Args:
-        job_id: The job ID to cancel
+        job_id: The job ID to cancel (a job group ID cancels every job in
+            the group)
 
     Returns:
         Success or error message
     """
+    if job_id in _job_groups:
+        return {
+            "status": "success",
+            "job_id": job_id,
+            "jobs": {child: job_manager.cancel_job(child) for child in _job_groups[job_id]}
+        }
     return job_manager.cancel_job(job_id)
 
+@mcp.tool()
+def get_aggregate_status(job_id: str) -> dict:
+    """
+    Get the combined status of a job group.
+
+    Args:
+        job_id: Job group ID returned from submit_large_peptide_screening
+
+    Returns:
+        Dictionary with the group status, a count of jobs per status and
+        the status of each job
+    """
+    if job_id not in _job_groups:
+        return {"status": "error", "error": f"Unknown job group: {job_id}"}
+    return _job_group_status(job_id)
+
 @mcp.tool()
 def list_jobs(status: Optional[str] = None) -> dict:
     """
@@ -91,12 +152,234 @@ def list_jobs(status: Optional[str] = None) -> dict:
     """
     return job_manager.list_jobs(status)
 
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+# Characters str.strip() removes from ASCII text
+_ASCII_WHITESPACE = ''.join(ch for ch in map(chr, range(128)) if ch.isspace())
+
+
+def _split_list(text: str) -> List[str]:
+    """
+    Split a comma-separated tool argument into stripped items.
+
+    ASCII input without any whitespace (the usual case for large pasted
+    peptide lists) is split in one str.split call, skipping the per-item strip.
+    """
+    items = text.split(',')
+    if not text.isascii() or any(ch in text for ch in _ASCII_WHITESPACE):
+        items = [item.strip() for item in items]
+    return items
+
+# Child job ids of each job group, keyed by the group's job id
+_job_groups: Dict[str, List[str]] = {}
+
+
+def _job_group_status(group_id: str) -> dict:
+    """
+    Combine the statuses of a job group's jobs.
+
+    The group has failed if any job failed, was cancelled if any job was
+    cancelled, is completed once every job is, is pending while no job has
+    started, and is running otherwise.
+    """
+    jobs = {child: job_manager.get_job_status(child) for child in _job_groups[group_id]}
+    statuses = [job.get("status") for job in jobs.values()]
+    counts = {status: statuses.count(status) for status in dict.fromkeys(statuses)}
+
+    if "failed" in counts:
+        status = "failed"
+    elif "cancelled" in counts:
+        status = "cancelled"
+    elif counts.get("completed") == len(statuses):
+        status = "completed"
+    elif counts.get("pending") == len(statuses):
+        status = "pending"
+    else:
+        status = "running"
+
+    return {"status": status, "job_id": group_id, "counts": counts, "jobs": jobs}
+
+# Job ids of earlier submissions, keyed by a hash of script path, arguments
+# and the contents of the input files they name
+_submitted_jobs: Dict[str, str] = {}
+
+# Submit arguments that name input files
+_INPUT_FILE_ARGS = ("input", "alpha_seq", "beta_seq")
+
+
+def _submit_job_once(
+    script_path: str,
+    args: Dict[str, Any],
+    job_name: str,
+    force: bool = False
+) -> dict:
+    """
+    Submit a job unless an identical one is already pending, running or done.
+
+    A repeat submission of the same script with the same arguments returns
+    the earlier job's id with "deduplicated": True instead of running
+    NetMHCIIpan again. Input files are identified by their contents, so
+    rewriting one submits a new job. A completed job only counts if its
+    output file (when it has one) still exists.
+
+    Args:
+        script_path: Script to run
+        args: Script arguments
+        job_name: Name for tracking (not part of the identity)
+        force: Always submit a new job
+
+    Returns:
+        Dictionary from job_manager.submit_job, or the deduplicated job_id
+    """
+    inputs = {
+        name: file_fingerprint(args[name])
+        for name in _INPUT_FILE_ARGS
+        if args.get(name) and os.path.isfile(args[name])
+    }
+    key = hashlib.blake2b(
+        dumps({"s": script_path, "a": args, "f": inputs}, sort_keys=True).encode()
+    ).hexdigest()
+
+    job_id = None if force else _submitted_jobs.get(key)
+    if job_id:
+        status = job_manager.get_job_status(job_id).get("status")
+        output = args.get("output")
+        if status in ("pending", "running") or (
+            status == "completed" and (not output or Path(output).exists())
+        ):
+            return {
+                "status": "submitted",
+                "job_id": job_id,
+                "job_status": status,
+                "deduplicated": True,
+                "message": f"Identical job {job_id} is already {status}"
+            }
+
+    result = job_manager.submit_job(script_path=script_path, args=args, job_name=job_name)
+    if result.get("job_id"):
+        _submitted_jobs[key] = result["job_id"]
+    return result
+
+# ==============================================================================
+# Request Batching
+# ==============================================================================
+
+def _batch_window_ms() -> float:
+    """Read the batching window, disabling batching if the value is invalid."""
+    value = os.environ.get("NETMHCIIPAN_MCP_BATCH_WINDOW_MS", "0")
+    try:
+        window = float(value)
+    except ValueError:
+        window = float("nan")
+    if not window >= 0:
+        logger.warning(f"Ignoring invalid NETMHCIIPAN_MCP_BATCH_WINDOW_MS={value!r}; request batching is disabled")
+        return 0.0
+    return window
+
+# Inline-peptide predictions for the same allele that arrive within this many
+# milliseconds of each other share one NetMHCIIpan run (0 disables batching)
+BATCH_WINDOW_MS = _batch_window_ms()
+
+# Upper bound on distinct peptides per shared run
+MAX_BATCH_PEPTIDES = 5000
+
+# Pending requests per allele, each drained by its own _batcher_loop task
+_batch_queues: Dict[str, asyncio.Queue] = {}
+
+# Running _batcher_loop tasks; the event loop only keeps weak references
+_batcher_tasks: Set[asyncio.Task] = set()
+
+
+async def _predict_peptides_batched(peptides: List[str], allele: str) -> dict:
+    """
+    Queue a peptide prediction to be merged with concurrent requests.
+
+    Args:
+        peptides: Distinct peptides of this request
+        allele: MHC II allele
+
+    Returns:
+        Dictionary shaped like run_peptide_prediction's result, holding only
+        this request's predictions and metadata (raw_output is None, as the
+        NetMHCIIpan run covered other requests as well)
+    """
+    queue = _batch_queues.get(allele)
+    if queue is None:
+        queue = _batch_queues[allele] = asyncio.Queue()
+        task = asyncio.create_task(_batcher_loop(allele, queue))
+        _batcher_tasks.add(task)
+        task.add_done_callback(_batcher_tasks.discard)
+
+    future = asyncio.get_running_loop().create_future()
+    await queue.put((peptides, future))
+    return await future
+
+
+async def _batcher_loop(allele: str, queue: asyncio.Queue) -> None:
+    """
+    Collect queued requests for one allele and answer them with shared runs.
+
+    A batch closes BATCH_WINDOW_MS after its first request or once it holds
+    MAX_BATCH_PEPTIDES peptides; the merged, deduplicated peptide list is
+    predicted in a worker thread and split back per request. A failing
+    batch fails only its own requests; if the loop itself stops, the queue
+    is unregistered and any request still waiting on it is failed.
+    """
+    loop = asyncio.get_running_loop()
+    batch = []
+    try:
+        while True:
+            batch = [await queue.get()]
+            try:
+                n_peptides = len(batch[0][0])
+                deadline = loop.time() + BATCH_WINDOW_MS / 1000
+                while n_peptides < MAX_BATCH_PEPTIDES:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    batch.append(item)
+                    n_peptides += len(item[0])
+
+                merged = list(dict.fromkeys(p for peptides, _ in batch for p in peptides))
+                result = await asyncio.to_thread(run_peptide_prediction, peptides=merged, allele=allele)
+
+                for peptides, future in batch:
+                    if not future.done():
+                        future.set_result({
+                            "result": expand_peptide_results(result["result"], peptides),
+                            "raw_output": None,
+                            "output_file": None,
+                            "metadata": {
+                                **result["metadata"],
+                                "peptides_count": len(peptides),
+                                "batch_peptides_count": len(merged)
+                            }
+                        })
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+    finally:
+        if _batch_queues.get(allele) is queue:
+            del _batch_queues[allele]
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(RuntimeError(f"Peptide batcher for {allele} stopped"))
+
 # ==============================================================================
 # Synchronous Tools (for fast operations)
 # ==============================================================================
 
 @mcp.tool()
-def predict_peptide_binding(
+async def predict_peptide_binding(
     input_file: Optional[str] = None,
     peptides: Optional[str] = None,
     allele: str = "DRB1_0101",
@@ -108,6 +391,12 @@ def predict_peptide_binding(
 
     Use this for quick peptide binding predictions that complete in under 1 second.
 
+    Repeated peptides are predicted once and copied back into the results;
+    raw_output is then None, as it would only hold the distinct peptides.
+    When NETMHCIIPAN_MCP_BATCH_WINDOW_MS is set, inline peptide requests
+    without output_file are merged with concurrent requests for the same
+    allele into one NetMHCIIpan run; raw_output is then None as well.
+
     Args:
         input_file: Path to file with peptides (one per line)
         peptides: Comma-separated peptides (alternative to input_file)
@@ -118,21 +407,32 @@ def predict_peptide_binding(
     Returns:
         Dictionary with predictions, strong/weak binders, and optional summary
     """
-    from peptide_prediction import run_peptide_prediction
-
     try:
-        # Convert comma-separated peptides to list if provided
+        # Convert comma-separated peptides to list if provided, scoring each
+        # distinct peptide only once
         peptide_list = None
+        unique_peptides = None
         if peptides:
-            peptide_list = [p.strip() for p in peptides.split(',')]
-
-        result = run_peptide_prediction(
-            input_file=input_file,
-            peptides=peptide_list,
-            allele=allele,
-            output_file=output_file,
-            summary=summary
-        )
+            peptide_list = _split_list(peptides)
+            unique_peptides = list(dict.fromkeys(peptide_list))
+
+        if unique_peptides and not output_file and BATCH_WINDOW_MS > 0:
+            result = await _predict_peptides_batched(unique_peptides, allele)
+        else:
+            result = await asyncio.to_thread(
+                run_peptide_prediction,
+                input_file=input_file,
+                peptides=unique_peptides,
+                allele=allele,
+                output_file=output_file,
+                summary=summary
+            )
+        # Fill in predictions for repeated peptides; the raw output only
+        # has one row per distinct peptide, so it no longer matches
+        if peptide_list and len(unique_peptides) < len(peptide_list):
+            result["result"] = expand_peptide_results(result["result"], peptide_list)
+            result["raw_output"] = None
+            result["metadata"] = {**result["metadata"], "peptides_count": len(peptide_list)}
         return {"status": "success", **result}
     except FileNotFoundError as e:
         return {"status": "error", "error": f"File not found: {e}"}
@@ -171,8 +471,6 @@ def analyze_protein_sequence(
     Returns:
         Dictionary with all binding predictions, strong/weak binders, and metadata
     """
-    from protein_analysis import run_protein_analysis
-
     try:
         result = run_protein_analysis(
             input_file=input_file,
@@ -207,6 +505,9 @@ def predict_custom_mhc_binding(
 
     Use this for custom allele predictions that complete in about 1 second.
 
+    Repeated peptides are predicted once and copied back into the results;
+    raw_output is then None, as it would only hold the distinct peptides.
+
     Args:
         input_file: Path to file with peptides
         peptides: Comma-separated peptides (alternative to input_file)
@@ -218,22 +519,29 @@ def predict_custom_mhc_binding(
     Returns:
         Dictionary with custom MHC predictions and binding classifications
     """
-    from custom_allele_prediction import run_custom_allele_prediction
-
     try:
-        # Convert comma-separated peptides to list if provided
+        # Convert comma-separated peptides to list if provided, scoring each
+        # distinct peptide only once
         peptide_list = None
+        unique_peptides = None
         if peptides:
-            peptide_list = [p.strip() for p in peptides.split(',')]
+            peptide_list = _split_list(peptides)
+            unique_peptides = list(dict.fromkeys(peptide_list))
 
         result = run_custom_allele_prediction(
             input_file=input_file,
-            peptides=peptide_list,
-            alpha_seq=alpha_seq,
-            beta_seq=beta_seq,
+            peptides=unique_peptides,
+            alpha_seq_file=alpha_seq,
+            beta_seq_file=beta_seq,
             output_file=output_file,
             summary=summary
         )
+        # Fill in predictions for repeated peptides; the raw output only
+        # has one row per distinct peptide, so it no longer matches
+        if peptide_list and len(unique_peptides) < len(peptide_list):
+            result["result"] = expand_peptide_results(result["result"], peptide_list)
+            result["raw_output"] = None
+            result["metadata"] = {**result["metadata"], "peptides_count": len(peptide_list)}
         return {"status": "success", **result}
     except FileNotFoundError as e:
         return {"status": "error", "error": f"File not found: {e}"}
@@ -249,7 +557,8 @@ def predict_binding_affinity(
     alleles: str,
     output_file: Optional[str] = None,
     excel: bool = False,
-    summary: bool = False
+    summary: bool = False,
+    strong_only: bool = False
 ) -> dict:
     """
     Predict binding affinity across multiple MHC II alleles (synchronous).
@@ -260,24 +569,25 @@ def predict_binding_affinity(
         input_file: Path to file with peptides
         alleles: Comma-separated MHC II alleles (e.g., "DRB1_0101,DRB1_1501")
         output_file: Path to save results (CSV or XLSX)
-        excel: Save as Excel format (requires pandas)
+        excel: Save as Excel format (requires xlsxwriter or openpyxl)
         summary: Include summary statistics
+        strong_only: Return (and save) only strong binders (rank <= 1%);
+            summary counts still cover all predictions
 
     Returns:
         Dictionary with results for each allele and combined statistics
     """
-    from batch_multi_allele import run_batch_multi_allele
-
     try:
         # Convert comma-separated alleles to list
-        allele_list = [a.strip() for a in alleles.split(',')]
+        allele_list = _split_list(alleles)
 
         result = run_batch_multi_allele(
             input_file=input_file,
             alleles=allele_list,
             output_file=output_file,
             excel=excel,
-            summary=summary
+            summary=summary,
+            strong_only=strong_only
         )
         return {"status": "success", **result}
     except FileNotFoundError as e:
@@ -299,7 +609,8 @@ def submit_peptide_prediction(
     allele: str = "DRB1_0101",
     output_dir: Optional[str] = None,
     job_name: Optional[str] = None,
-    summary: bool = False
+    summary: bool = False,
+    force: bool = False
 ) -> dict:
     """
     Submit peptide binding prediction for background processing.
@@ -313,6 +624,7 @@ def submit_peptide_prediction(
         output_dir: Directory to save outputs
         job_name: Optional name for tracking
         summary: Include summary statistics
+        force: Submit even if an identical job is already running or completed
 
     Returns:
         Dictionary with job_id. Use:
@@ -320,7 +632,7 @@ def submit_peptide_prediction(
         - get_job_result(job_id) to get results
         - get_job_log(job_id) to see logs
     """
-    script_path = str(SCRIPTS_DIR / "peptide_prediction.py")
+    script_path = PEPTIDE_SCRIPT
 
     args = {
         "allele": allele,
@@ -333,14 +645,9 @@ def submit_peptide_prediction(
         args["peptides"] = peptides
 
     if output_dir:
-        output_file = Path(output_dir) / f"peptide_pred_{job_name or 'output'}.txt"
-        args["output"] = str(output_file)
+        args["output"] = os.path.join(output_dir, f"peptide_pred_{job_name or 'output'}.txt")
 
-    return job_manager.submit_job(
-        script_path=script_path,
-        args=args,
-        job_name=job_name or "peptide_prediction"
-    )
+    return _submit_job_once(script_path, args, job_name or "peptide_prediction", force)
 
 @mcp.tool()
 def submit_protein_analysis(
@@ -352,7 +659,8 @@ def submit_protein_analysis(
     sorted_output: bool = False,
     output_dir: Optional[str] = None,
     job_name: Optional[str] = None,
-    summary: bool = False
+    summary: bool = False,
+    force: bool = False
 ) -> dict:
     """
     Submit protein sequence analysis for background processing.
@@ -369,11 +677,12 @@ def submit_protein_analysis(
         output_dir: Directory to save outputs
         job_name: Optional name for tracking
         summary: Include summary statistics
+        force: Submit even if an identical job is already running or completed
 
     Returns:
         Dictionary with job_id for tracking the analysis
     """
-    script_path = str(SCRIPTS_DIR / "protein_analysis.py")
+    script_path = PROTEIN_SCRIPT
 
     args = {
         "allele": allele,
@@ -389,14 +698,9 @@ def submit_protein_analysis(
         args["protein_sequence"] = protein_sequence
 
     if output_dir:
-        output_file = Path(output_dir) / f"protein_analysis_{job_name or 'output'}.txt"
-        args["output"] = str(output_file)
+        args["output"] = os.path.join(output_dir, f"protein_analysis_{job_name or 'output'}.txt")
 
-    return job_manager.submit_job(
-        script_path=script_path,
-        args=args,
-        job_name=job_name or "protein_analysis"
-    )
+    return _submit_job_once(script_path, args, job_name or "protein_analysis", force)
 
 @mcp.tool()
 def submit_custom_mhc_prediction(
@@ -406,7 +710,8 @@ def submit_custom_mhc_prediction(
     beta_seq: Optional[str] = None,
     output_dir: Optional[str] = None,
     job_name: Optional[str] = None,
-    summary: bool = False
+    summary: bool = False,
+    force: bool = False
 ) -> dict:
     """
     Submit custom MHC prediction for background processing.
@@ -421,11 +726,12 @@ def submit_custom_mhc_prediction(
         output_dir: Directory to save outputs
         job_name: Optional name for tracking
         summary: Include summary statistics
+        force: Submit even if an identical job is already running or completed
 
     Returns:
         Dictionary with job_id for tracking the custom prediction
     """
-    script_path = str(SCRIPTS_DIR / "custom_allele_prediction.py")
+    script_path = CUSTOM_SCRIPT
 
     args = {
         "summary": summary
@@ -442,14 +748,9 @@ def submit_custom_mhc_prediction(
         args["beta_seq"] = beta_seq
 
     if output_dir:
-        output_file = Path(output_dir) / f"custom_mhc_{job_name or 'output'}.txt"
-        args["output"] = str(output_file)
+        args["output"] = os.path.join(output_dir, f"custom_mhc_{job_name or 'output'}.txt")
 
-    return job_manager.submit_job(
-        script_path=script_path,
-        args=args,
-        job_name=job_name or "custom_mhc_prediction"
-    )
+    return _submit_job_once(script_path, args, job_name or "custom_mhc_prediction", force)
 
 @mcp.tool()
 def submit_batch_multi_allele_screening(
@@ -458,7 +759,8 @@ def submit_batch_multi_allele_screening(
     output_dir: Optional[str] = None,
     excel: bool = False,
     job_name: Optional[str] = None,
-    summary: bool = False
+    summary: bool = False,
+    force: bool = False
 ) -> dict:
     """
     Submit batch multi-allele screening for background processing.
@@ -470,14 +772,15 @@ def submit_batch_multi_allele_screening(
         input_file: Path to file with peptides
         alleles: Comma-separated MHC II alleles
         output_dir: Directory to save outputs
-        excel: Save as Excel format (requires pandas)
+        excel: Save as Excel format (requires xlsxwriter or openpyxl)
         job_name: Optional name for tracking
         summary: Include summary statistics
+        force: Submit even if an identical job is already running or completed
 
     Returns:
         Dictionary with job_id for tracking the batch screening
     """
-    script_path = str(SCRIPTS_DIR / "batch_multi_allele.py")
+    script_path = BATCH_SCRIPT
 
     args = {
         "input": input_file,
@@ -488,13 +791,10 @@ def submit_batch_multi_allele_screening(
 
     if output_dir:
         ext = "xlsx" if excel else "csv"
-        output_file = Path(output_dir) / f"batch_multi_allele_{job_name or 'output'}.{ext}"
-        args["output"] = str(output_file)
+        args["output"] = os.path.join(output_dir, f"batch_multi_allele_{job_name or 'output'}.{ext}")
 
-    return job_manager.submit_job(
-        script_path=script_path,
-        args=args,
-        job_name=job_name or f"batch_screening_{len(alleles.split(','))}_alleles"
+    return _submit_job_once(
+        script_path, args, job_name or f"batch_screening_{len(alleles.split(','))}_alleles", force
     )
 
 # ==============================================================================
@@ -506,51 +806,73 @@ def submit_large_peptide_screening(
     input_files: List[str],
     allele: str = "DRB1_0101",
     output_dir: Optional[str] = None,
-    job_name: Optional[str] = None
+    job_name: Optional[str] = None,
+    force: bool = False
 ) -> dict:
     """
     Submit large-scale peptide screening across multiple input files.
 
-    Processes multiple peptide files against a single allele in parallel.
-    Suitable for high-throughput screening workflows.
+    Processes multiple peptide files against a single allele in parallel:
+    each file is submitted as its own job, so the files run concurrently.
+    The jobs form a group whose job_id works with get_job_status,
+    get_job_result and cancel_job like a single job's, and with
+    get_aggregate_status. Suitable for high-throughput screening workflows.
 
     Args:
         input_files: List of paths to peptide files
         allele: MHC II allele for prediction
         output_dir: Directory to save all outputs
         job_name: Optional name for the batch job
+        force: Submit even if an identical job is already running or completed
 
     Returns:
-        Dictionary with job_id for tracking the large screening job
+        Dictionary with the group's job_id, and job_ids with one job per
+        input file (in input order)
+
+    Raises:
+        ValueError: If input_files is empty
     """
-    # For now, we'll process files sequentially
-    # In a production system, this could be parallelized
-    script_path = str(SCRIPTS_DIR / "peptide_prediction.py")
+    if not input_files:
+        raise ValueError("input_files must list at least one peptide file")
+
+    script_path = PEPTIDE_SCRIPT
+    job_name = job_name or f"large_screening_{len(input_files)}_files"
+
+    jobs = []
+    for i, input_file in enumerate(input_files, 1):
+        args = {
+            "input": input_file,
+            "allele": allele,
+            "summary": True
+        }
 
-    # Convert list to comma-separated string for the script
-    inputs_str = ",".join(input_files)
+        if output_dir:
+            args["output"] = os.path.join(output_dir, f"{job_name}_{i}.txt")
 
-    args = {
-        "input": inputs_str,  # Modified script would need to handle multiple files
-        "allele": allele,
-        "summary": True
-    }
+        jobs.append(_submit_job_once(script_path, args, f"{job_name}_{i}", force))
 
-    if output_dir:
-        args["output_dir"] = output_dir
+    job_ids = [job.get("job_id") for job in jobs]
+    if not any(job_ids):
+        return {"status": "error", "error": "No jobs could be submitted", "jobs": jobs}
+    group_id = f"group_{uuid.uuid4().hex[:12]}"
+    _job_groups[group_id] = [job_id for job_id in job_ids if job_id]
 
-    return job_manager.submit_job(
-        script_path=script_path,
-        args=args,
-        job_name=job_name or f"large_screening_{len(input_files)}_files"
-    )
+    return {
+        "status": "submitted",
+        "job_id": group_id,
+        "job_name": job_name,
+        "job_ids": job_ids,
+        "jobs": jobs,
+        "count": len(jobs)
+    }
 
 @mcp.tool()
 def submit_multi_allele_screening(
     input_file: str,
     alleles: List[str],
     output_dir: Optional[str] = None,
-    job_name: Optional[str] = None
+    job_name: Optional[str] = None,
+    force: bool = False
 ) -> dict:
     """
     Submit comprehensive multi-allele screening.
@@ -563,11 +885,12 @@ def submit_multi_allele_screening(
         alleles: List of MHC II alleles to test
         output_dir: Directory to save results
         job_name: Optional name for tracking
+        force: Submit even if an identical job is already running or completed
 
     Returns:
         Dictionary with job_id for tracking the multi-allele screening
     """
-    script_path = str(SCRIPTS_DIR / "batch_multi_allele.py")
+    script_path = BATCH_SCRIPT
 
     # Convert list to comma-separated string
     alleles_str = ",".join(alleles)
@@ -580,14 +903,9 @@ def submit_multi_allele_screening(
     }
 
     if output_dir:
-        output_file = Path(output_dir) / f"multi_allele_screening_{job_name or 'output'}.xlsx"
-        args["output"] = str(output_file)
+        args["output"] = os.path.join(output_dir, f"multi_allele_screening_{job_name or 'output'}.xlsx")
 
-    return job_manager.submit_job(
-        script_path=script_path,
-        args=args,
-        job_name=job_name or f"screening_{len(alleles)}_alleles"
-    )
+    return _submit_job_once(script_path, args, job_name or f"screening_{len(alleles)}_alleles", force)
 
 # ==============================================================================
 # Utility Tools
@@ -598,8 +916,10 @@ def export_predictions_to_excel(job_id: str, output_file: str) -> dict:
     """
     Export completed job results to Excel format.
 
-    Takes the text output from a completed job and converts it to Excel
-    format for better analysis and visualization.
+    Parses the NetMHCIIpan output of a completed job and writes it as an
+    Excel workbook with a per-allele Summary sheet and a Detailed_Results
+    sheet (requires xlsxwriter or openpyxl). Rows are streamed into the
+    workbook, and output the job saved to a file is read from that file.
 
     Args:
         job_id: ID of a completed job
@@ -615,10 +935,33 @@ def export_predictions_to_excel(job_id: str, output_file: str) -> dict:
         if result["status"] != "success":
             return result
 
-        # For this demo, we'll just save the text output
-        # In production, you'd parse and convert to proper Excel format
-        with open(output_file, 'w') as f:
-            f.write(str(result["result"]))
+        # Prefer the output file the job saved; otherwise parse the output
+        # carried in the result itself
+        job_output = result["result"]
+        if not isinstance(job_output, dict):
+            job_output = {"raw_output": str(job_output)}
+        saved_output = job_output.get("output_file")
+
+        if saved_output and Path(saved_output).exists():
+            with open_for_streaming(saved_output) as f:
+                sections = parse_netmhciipan_sections(f, columnar=True)
+        else:
+            sections = parse_netmhciipan_sections(job_output.get("raw_output") or "", columnar=True)
+
+        if not sections:
+            return {"status": "error", "error": f"No NetMHCIIpan predictions found for job {job_id}"}
+
+        # One entry per results section, named after its allele; repeated
+        # names (custom sequences, appended reruns) get the section number
+        all_results = {}
+        for i, section in enumerate(sections, 1):
+            mhc = section["columns"]["mhc"]
+            name = mhc[0] if mhc else f"section_{i}"
+            if name in all_results:
+                name = f"{name}_{i}"
+            all_results[name] = section
+
+        save_excel_output(all_results, output_file)
 
         return {
             "status": "success",
@@ -631,7 +974,7 @@ def export_predictions_to_excel(job_id: str, output_file: str) -> dict:
         return {"status": "error", "error": str(e)}
 
 @mcp.tool()
-def analyze_netmhcpan_output(output_file: str) -> dict:
+def analyze_netmhcpan_output(output_file: str, strong_only: bool = False) -> dict:
     """
     Analyze NetMHCIIpan output file and generate summary statistics.
 
@@ -640,6 +983,7 @@ def analyze_netmhcpan_output(output_file: str) -> dict:
 
     Args:
         output_file: Path to NetMHCIIpan output file
+        strong_only: Preview only strong binders (rank <= 1%)
 
     Returns:
         Dictionary with detailed analysis and statistics
@@ -648,24 +992,22 @@ def analyze_netmhcpan_output(output_file: str) -> dict:
         if not Path(output_file).exists():
             return {"status": "error", "error": f"Output file not found: {output_file}"}
 
-        # Use the parser from the shared library
-        sys.path.insert(0, str(SCRIPTS_DIR / "lib"))
-        from parsers import parse_netmhciipan_output, format_summary_report
-
-        with open(output_file) as f:
-            raw_output = f.read()
+        # Stream the file through the summarizer; only the counts, the
+        # preview rows and the top binders are kept in memory
+        with open_for_streaming(output_file) as f:
+            parsed_data = summarize_netmhciipan_output(f, preview=10, strong_only=strong_only)
 
-        parsed_data = parse_netmhciipan_output(raw_output)
         summary = format_summary_report(parsed_data)
+        counts = parsed_data["summary"]
 
         return {
             "status": "success",
             "analysis": {
-                "total_predictions": len(parsed_data["all_predictions"]),
-                "strong_binders": len(parsed_data["strong_binders"]),
-                "weak_binders": len(parsed_data["weak_binders"]),
+                "total_predictions": counts["total_predictions"],
+                "strong_binders": counts["strong_binders_count"],
+                "weak_binders": counts["weak_binders_count"],
                 "summary_report": summary,
-                "detailed_predictions": parsed_data["all_predictions"][:10]  # First 10 for preview
+                "detailed_predictions": parsed_data["preview"]  # First 10 for preview
             }
         }
 
@@ -707,7 +1049,8 @@ def get_server_info() -> dict:
                     "get_job_result",
                     "get_job_log",
                     "cancel_job",
-                    "list_jobs"
+                    "list_jobs",
+                    "get_aggregate_status"
                 ],
                 "utilities": [
                     "export_predictions_to_excel",
@@ -0,0 +1,92 @@
+"""Shared fixtures for the script and library tests."""
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = ROOT_DIR / "scripts"
+for path in (SCRIPTS_DIR, SCRIPTS_DIR / "lib"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+class FakeJobManager:
+    """In-memory job manager; jobs only change status when a test says so."""
+
+    def __init__(self):
+        self.jobs = {}
+
+    def submit_job(self, script_path, args, job_name):
+        job_id = f"job{len(self.jobs) + 1}"
+        self.jobs[job_id] = {"status": "pending", "args": args, "job_name": job_name}
+        return {"status": "submitted", "job_id": job_id}
+
+    def get_job_status(self, job_id):
+        return {"job_id": job_id, "status": self.jobs[job_id]["status"]}
+
+    def get_job_result(self, job_id):
+        return {"status": "success", "result": self.jobs[job_id]["args"]["input"]}
+
+    def cancel_job(self, job_id):
+        self.jobs[job_id]["status"] = "cancelled"
+        return {"status": "success"}
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """The MCP server module, with a FakeJobManager behind the job tools."""
+    pytest.importorskip("fastmcp")
+    pytest.importorskip("loguru")
+    src_dir = str(ROOT_DIR / "src")
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+    try:
+        importlib.import_module("jobs.manager")
+    except ImportError:
+        # The job manager package is not part of every checkout; the tests
+        # replace it with FakeJobManager below either way
+        manager = types.ModuleType("jobs.manager")
+        manager.job_manager = None
+        monkeypatch.setitem(sys.modules, "jobs", types.ModuleType("jobs"))
+        monkeypatch.setitem(sys.modules, "jobs.manager", manager)
+
+    module = importlib.import_module("server")
+    monkeypatch.setattr(module, "job_manager", FakeJobManager())
+    monkeypatch.setattr(module, "_job_groups", {})
+    monkeypatch.setattr(module, "_submitted_jobs", {})
+    return module
+
+
+def format_prediction_line(position, mhc, peptide, rank, score=0.5, bind_level=""):
+    """Format one prediction row the way NetMHCIIpan prints it."""
+    core = peptide[:9]
+    line = (
+        f"{position:5d} {mhc:>16s} {peptide:>20s} {core:>11s} {3:4d} {0:3d} {0:3d} "
+        f"{0:3d} {0:3d} {core:>11s} {'Sequence':>15s} {score:8.6f} {rank:8.2f} {'NA':>8s} {bind_level}"
+    )
+    return line.rstrip()
+
+
+@pytest.fixture
+def make_output():
+    """Build NetMHCIIpan output text from {allele: [(peptide, rank), ...]}."""
+    def build(sections):
+        lines = ["# NetMHCIIpan version 4.3", "# Input is in PEPTIDE format"]
+        for mhc, rows in sections.items():
+            lines += [
+                "",
+                "-" * 100,
+                " Pos           MHC              Peptide       Core   Of  Gp  Gl  Ip  Il"
+                "      Icore   Identity     Score   %Rank Exp_Bind BindLevel",
+                "-" * 100,
+            ]
+            for position, (peptide, rank) in enumerate(rows, 1):
+                bind_level = "<=SB" if rank <= 1 else ("<=WB" if rank <= 5 else "")
+                lines.append(format_prediction_line(position, mhc, peptide, rank, bind_level=bind_level))
+            lines += ["-" * 100, "Number of strong binders: 0 Number of weak binders: 0", "-" * 100]
+        return "\n".join(lines) + "\n"
+    return build
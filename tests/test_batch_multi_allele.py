@@ -0,0 +1,75 @@
+"""Tests for the combined multi-allele run in batch_multi_allele."""
+
+import batch_multi_allele
+
+
+ROWS = [("PKYVKQNTLKLAT", 0.5), ("GELIGILNAAKVPAD", 3.0), ("AAAGAEAGKATTE", 40.0)]
+
+
+def _fake_run(output_text, calls):
+    def run_netmhciipan(**kwargs):
+        calls.append(kwargs["allele"])
+        return iter(output_text.splitlines(keepends=True))
+    return run_netmhciipan
+
+
+def test_combined_run_matches_sections_by_mhc_column(monkeypatch, make_output):
+    output = make_output({"DRB1*01:01": ROWS, "HLA-DRB1_1501": ROWS[:2]})
+    calls = []
+    monkeypatch.setattr(batch_multi_allele, "run_netmhciipan", _fake_run(output, calls))
+
+    results = batch_multi_allele._predict_combined(
+        ["DRB1_0101", "DRB1_1501"], "input.txt", "peptide", False
+    )
+
+    assert calls == ["DRB1_0101,DRB1_1501"]
+    assert results["DRB1_0101"]["n"] == 3
+    assert results["DRB1_1501"]["n"] == 2
+    assert "raw_output" not in results["DRB1_0101"]
+
+
+def test_combined_run_rejects_sections_in_another_order(monkeypatch, make_output):
+    output = make_output({"DRB1_1501": ROWS, "DRB1_0101": ROWS})
+    monkeypatch.setattr(batch_multi_allele, "run_netmhciipan", _fake_run(output, []))
+
+    assert batch_multi_allele._predict_combined(
+        ["DRB1_0101", "DRB1_1501"], "input.txt", "peptide", False
+    ) is None
+
+
+def test_combined_run_checks_mhc_even_when_strong_only_drops_rows(monkeypatch, make_output):
+    output = make_output({"DRB1_0101": ROWS, "DRB1_1501": ROWS[1:]})
+    monkeypatch.setattr(batch_multi_allele, "run_netmhciipan", _fake_run(output, []))
+
+    results = batch_multi_allele._predict_combined(
+        ["DRB1_0101", "DRB1_1501"], "input.txt", "peptide", False, strong_only=True
+    )
+
+    assert results["DRB1_0101"]["n"] == 1
+    assert results["DRB1_1501"]["n"] == 0
+    assert results["DRB1_1501"]["summary"]["total_predictions"] == 2
+
+
+def test_batch_falls_back_to_per_allele_runs_on_mismatch(monkeypatch, make_output, tmp_path):
+    input_file = tmp_path / "peptides.txt"
+    input_file.write_text("\n".join(peptide for peptide, _ in ROWS) + "\n")
+    calls = []
+
+    def run_netmhciipan(**kwargs):
+        calls.append(kwargs["allele"])
+        alleles = kwargs["allele"].split(",")
+        # The combined run reports its sections in reverse order
+        output = make_output({allele: ROWS for allele in reversed(alleles)})
+        return iter(output.splitlines(keepends=True))
+
+    monkeypatch.setattr(batch_multi_allele, "run_netmhciipan", run_netmhciipan)
+
+    result = batch_multi_allele.run_batch_multi_allele(
+        input_file=input_file,
+        alleles=["DRB1_0101", "DRB1_1501"],
+        config={"max_parallel_jobs": 1}
+    )
+
+    assert calls == ["DRB1_0101,DRB1_1501", "DRB1_0101", "DRB1_1501"]
+    for allele in ("DRB1_0101", "DRB1_1501"):
+        assert set(result["results"][allele]["columns"]["mhc"]) == {allele}
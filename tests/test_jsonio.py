@@ -0,0 +1,28 @@
+"""Tests for the cached config loader in jsonio."""
+
+import os
+
+from jsonio import dumps, load_config
+
+
+def test_load_config_isolates_callers_including_nested_sections(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(dumps({"allele": "DRB1_0101", "output": {"excel": {"enabled": False}}, "sets": ["a"]}))
+
+    first = load_config(path)
+    first["allele"] = "changed"
+    first["output"]["excel"]["enabled"] = True
+    first["sets"].append("b")
+
+    assert load_config(path) == {"allele": "DRB1_0101", "output": {"excel": {"enabled": False}}, "sets": ["a"]}
+
+
+def test_load_config_picks_up_edits(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(dumps({"cache": True}))
+    assert load_config(path) == {"cache": True}
+
+    path.write_text(dumps({"cache": False, "strong_only": True}))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert load_config(path) == {"cache": False, "strong_only": True}
@@ -0,0 +1,129 @@
+"""Tests for the on-disk NetMHCIIpan output cache."""
+
+import os
+
+import pytest
+
+import outputcache
+from outputcache import (
+    cache_dir,
+    load_cached_output,
+    output_cache_key,
+    store_cached_output,
+)
+
+
+@pytest.fixture
+def binary(tmp_path, monkeypatch):
+    """A stand-in NetMHCIIpan binary whose stat can be changed."""
+    path = tmp_path / "netMHCIIpan"
+    path.write_text("#!/bin/sh\n")
+    monkeypatch.setattr(outputcache, "find_netmhciipan_path", lambda: path)
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch, binary):
+    """Point the cache at an empty temporary directory."""
+    directory = tmp_path / "cache"
+    monkeypatch.setenv("NETMHCIIPAN_MCP_CACHE_DIR", str(directory))
+    cache_dir.cache_clear()
+    yield directory
+    cache_dir.cache_clear()
+
+
+def _age(path, seconds):
+    """Move a file's modification time `seconds` into the past."""
+    mtime = path.stat().st_mtime_ns - seconds * 1_000_000_000
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_cache_dir_follows_environment(cache):
+    assert cache_dir() == cache
+
+
+def test_key_depends_on_every_input(cache):
+    key = output_cache_key("peptide", "PKYVKQNTLKLAT\n", "DRB1_0101")
+
+    assert output_cache_key("peptide", "PKYVKQNTLKLAT\n", "DRB1_0101") == key
+    assert output_cache_key("peptide", "PKYVKQNTLKLAT\n", "DRB1_1501") != key
+    assert output_cache_key("protein", "PKYVKQNTLKLAT\n", "DRB1_0101") != key
+    assert output_cache_key("peptide", "GELIGILNAAKVPAD\n", "DRB1_0101") != key
+    # Parts are separated, so shifting text between them changes the key
+    assert output_cache_key("peptide", "PKYVKQNTLKLAT\n", "DRB1_010", "1") != key
+
+
+def test_key_changes_when_binary_is_replaced(cache, binary):
+    key = output_cache_key("peptide", "PKYVKQNTLKLAT\n", "DRB1_0101")
+
+    _age(binary, 10)
+    assert output_cache_key("peptide", "PKYVKQNTLKLAT\n", "DRB1_0101") != key
+
+    stat = binary.stat()
+    binary.write_text("#!/bin/sh\n# 4.3e\n")
+    os.utime(binary, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert output_cache_key("peptide", "PKYVKQNTLKLAT\n", "DRB1_0101") != key
+
+
+def test_store_and_load(cache):
+    key = output_cache_key("peptide", "PKYVKQNTLKLAT\n", "DRB1_0101")
+    assert load_cached_output(key) is None
+
+    store_cached_output(key, "raw output\n")
+
+    assert load_cached_output(key) == "raw output\n"
+    assert [p.name for p in cache.iterdir()] == [key]
+
+
+def test_load_refreshes_entry_for_lru_pruning(cache):
+    store_cached_output("a", "x")
+    _age(cache / "a", 100)
+    before = (cache / "a").stat().st_mtime_ns
+
+    load_cached_output("a")
+
+    assert (cache / "a").stat().st_mtime_ns > before
+
+
+def _populate(cache, keys, size=1):
+    """Store entries, the first key oldest."""
+    for age, key in enumerate(reversed(keys), 1):
+        store_cached_output(key, "x" * size)
+        _age(cache / key, age)
+
+
+def test_prune_keeps_most_recently_used_entries(cache, monkeypatch):
+    _populate(cache, ["a", "b", "c", "d"])
+    # Using "a" makes "b" the least recently used entry
+    load_cached_output("a")
+    monkeypatch.setattr(outputcache, "MAX_ENTRIES", 3)
+
+    store_cached_output("e", "x")
+
+    assert sorted(p.name for p in cache.iterdir()) == ["a", "d", "e"]
+
+
+def test_prune_respects_byte_limit(cache, monkeypatch):
+    _populate(cache, ["a", "b", "c"], size=10)
+    monkeypatch.setattr(outputcache, "MAX_BYTES", 25)
+
+    store_cached_output("d", "x" * 10)
+
+    names = sorted(p.name for p in cache.iterdir())
+    assert names == ["c", "d"]
+    assert sum((cache / name).stat().st_size for name in names) <= 25
+
+
+def test_prune_leaves_in_flight_temporary_files(cache, monkeypatch):
+    monkeypatch.setattr(outputcache, "MAX_ENTRIES", 1)
+    cache.mkdir()
+    temp_file = cache / ".b.tmp1234"
+    temp_file.write_text("partial")
+    _age(temp_file, 100)
+
+    store_cached_output("a", "x")
+    store_cached_output("b", "y")
+
+    assert temp_file.exists()
+    assert load_cached_output("b") == "y"
+    assert load_cached_output("a") is None
@@ -0,0 +1,110 @@
+"""Parity tests for the generated row parsers in parsers.py."""
+
+import itertools
+
+import pytest
+
+from parsers import (
+    PREDICTION_FIELDS,
+    SUMMARY_FIELDS,
+    _ROW_PARSERS,
+    parse_netmhciipan_output,
+    parse_prediction_line,
+)
+
+FULL_ROW = [
+    "7", "DRB1_0101", "PKYVKQNTLKLAT", "YVKQNTLKL", "2", "0", "0", "0", "0",
+    "YVKQNTLKL", "Sequence", "0.871234", "0.45", "NA", "<=SB",
+]
+
+FIELD_SUBSETS = [
+    None,
+    SUMMARY_FIELDS,
+    ("peptide",),
+    ("mhc", "score"),
+    ("position", "identity", "exp_bind", "bind_level"),
+    ("core", "of", "gp", "gl", "ip", "il", "icore"),
+]
+
+
+def reference_parse(line):
+    """The plain row parser the generated parsers replaced."""
+    try:
+        parts = line.strip().split()
+        if len(parts) < 10:
+            return None
+
+        return {
+            'position': int(parts[0]),
+            'mhc': parts[1],
+            'peptide': parts[2],
+            'core': parts[3] if len(parts) > 3 else "",
+            'of': parts[4] if len(parts) > 4 else "",
+            'gp': parts[5] if len(parts) > 5 else "",
+            'gl': parts[6] if len(parts) > 6 else "",
+            'ip': parts[7] if len(parts) > 7 else "",
+            'il': parts[8] if len(parts) > 8 else "",
+            'icore': parts[9] if len(parts) > 9 else "",
+            'identity': parts[10] if len(parts) > 10 else "",
+            'score': float(parts[11]) if len(parts) > 11 and parts[11] != 'NA' else None,
+            'rank': float(parts[12]) if len(parts) > 12 and parts[12] != 'NA' else 100.0,
+            'exp_bind': parts[13] if len(parts) > 13 else "",
+            'bind_level': parts[14] if len(parts) > 14 else ""
+        }
+    except (ValueError, IndexError):
+        return None
+
+
+def expected(line, fields):
+    reference = reference_parse(line)
+    if reference is None or fields is None:
+        return reference
+    return {field: reference[field] for field in PREDICTION_FIELDS if field in set(fields) | {'rank'}}
+
+
+def row_variants():
+    """Rows of every length from too short to over-long, with odd values."""
+    for n_columns in range(8, len(FULL_ROW) + 2):
+        parts = (FULL_ROW + ["extra"])[:n_columns]
+        yield parts
+        if n_columns > 11:
+            yield parts[:11] + ["NA"] + parts[12:]
+        if n_columns > 12:
+            yield parts[:12] + ["NA"] + parts[13:]
+            yield parts[:12] + ["1e-3"] + parts[13:]
+        yield ["x"] + parts[1:]
+        if n_columns > 11:
+            yield parts[:11] + ["bad"] + parts[12:]
+        if n_columns > 12:
+            yield parts[:12] + ["bad"] + parts[13:]
+
+
+@pytest.mark.parametrize("fields", FIELD_SUBSETS)
+def test_row_parsers_match_reference_for_every_row_length(fields):
+    for parts in row_variants():
+        line = "   " + "  ".join(parts)
+        assert parse_prediction_line(line, fields) == expected(line, fields), line
+
+
+def test_row_parsers_are_cached_per_length_and_fields():
+    _ROW_PARSERS.clear()
+    for n_columns, fields in itertools.product(range(10, 17), (None, SUMMARY_FIELDS)):
+        parse_prediction_line(" ".join((FULL_ROW + ["extra"])[:n_columns]), fields)
+
+    # Rows longer than 15 columns share the 15-column parser
+    assert sorted({n for n, _ in _ROW_PARSERS}) == list(range(10, 16))
+    assert len(_ROW_PARSERS) == 12
+
+
+@pytest.mark.parametrize("fields", FIELD_SUBSETS)
+def test_section_parse_matches_reference(fields, make_output):
+    lines = [" ".join(parts) for parts in row_variants()]
+    output = make_output({}) + "\n".join(
+        [" Pos           MHC              Peptide", "-" * 100, *lines, "Number of strong binders: 0"]
+    )
+
+    results = parse_netmhciipan_output(output, fields=fields)
+
+    assert results['all_predictions'] == [
+        prediction for prediction in (expected(line, fields) for line in lines) if prediction
+    ]
@@ -0,0 +1,145 @@
+"""Tests for request batching in predict_peptide_binding."""
+
+import asyncio
+
+import pytest
+
+from parsers import parse_netmhciipan_output
+
+
+@pytest.fixture
+def batching(server, monkeypatch, make_output):
+    """Enable batching and record each (fake) NetMHCIIpan run."""
+    monkeypatch.setattr(server, "BATCH_WINDOW_MS", 50)
+    monkeypatch.setattr(server, "_batch_queues", {})
+    monkeypatch.setattr(server, "_batcher_tasks", set())
+    runs = []
+
+    def run_peptide_prediction(peptides, allele, **kwargs):
+        runs.append((allele, list(peptides)))
+        if "FAIL" in peptides:
+            raise RuntimeError("NetMHCIIpan failed")
+        ranks = {"PKYVKQNTLKLAT": 0.5, "GELIGILNAAKVPAD": 3.0}
+        output = make_output({allele: [(p, ranks.get(p, 50.0)) for p in peptides]})
+        return {
+            "result": parse_netmhciipan_output(output),
+            "raw_output": output,
+            "output_file": None,
+            "metadata": {"input_file": None, "peptides_count": len(peptides), "allele": allele, "config": {}}
+        }
+
+    monkeypatch.setattr(server, "run_peptide_prediction", run_peptide_prediction)
+    return runs
+
+
+def _predict(server, *requests):
+    async def main():
+        return await asyncio.gather(*(
+            server.predict_peptide_binding(peptides=peptides, allele=allele)
+            for peptides, allele in requests
+        ))
+    return asyncio.run(main())
+
+
+def test_concurrent_requests_share_one_run(server, batching):
+    first, second = _predict(
+        server,
+        ("PKYVKQNTLKLAT,AAAGAEAGKATTE", "DRB1_0101"),
+        ("GELIGILNAAKVPAD,PKYVKQNTLKLAT,PKYVKQNTLKLAT", "DRB1_0101"),
+    )
+
+    assert batching == [("DRB1_0101", ["PKYVKQNTLKLAT", "AAAGAEAGKATTE", "GELIGILNAAKVPAD"])]
+    assert [p["peptide"] for p in first["result"]["all_predictions"]] == ["PKYVKQNTLKLAT", "AAAGAEAGKATTE"]
+    assert [p["peptide"] for p in second["result"]["all_predictions"]] == [
+        "GELIGILNAAKVPAD", "PKYVKQNTLKLAT", "PKYVKQNTLKLAT"
+    ]
+    assert second["result"]["summary"]["strong_binders_count"] == 2
+    assert first["raw_output"] is None and second["raw_output"] is None
+
+
+def test_metadata_describes_each_request(server, batching):
+    first, second = _predict(
+        server,
+        ("PKYVKQNTLKLAT", "DRB1_0101"),
+        ("GELIGILNAAKVPAD,GELIGILNAAKVPAD,AAAGAEAGKATTE", "DRB1_0101"),
+    )
+
+    assert first["metadata"]["peptides_count"] == 1
+    assert second["metadata"]["peptides_count"] == 3
+    assert first["metadata"]["batch_peptides_count"] == second["metadata"]["batch_peptides_count"] == 3
+
+
+def test_alleles_are_batched_separately(server, batching):
+    _predict(server, ("PKYVKQNTLKLAT", "DRB1_0101"), ("PKYVKQNTLKLAT", "DRB1_1501"))
+
+    assert sorted(batching) == [("DRB1_0101", ["PKYVKQNTLKLAT"]), ("DRB1_1501", ["PKYVKQNTLKLAT"])]
+
+
+def test_failing_batch_fails_only_its_requests(server, batching):
+    async def main():
+        failed = await asyncio.gather(
+            server.predict_peptide_binding(peptides="FAIL", allele="DRB1_0101"),
+            server.predict_peptide_binding(peptides="PKYVKQNTLKLAT", allele="DRB1_0101"),
+        )
+        # The batcher survives and serves the next batch for the allele
+        after = await server.predict_peptide_binding(peptides="PKYVKQNTLKLAT", allele="DRB1_0101")
+        return failed, after
+
+    failed, after = asyncio.run(main())
+
+    assert [r["status"] for r in failed] == ["error", "error"]
+    assert after["status"] == "success"
+    assert len(batching) == 2
+
+
+def test_error_while_splitting_results_does_not_hang_later_requests(server, batching, monkeypatch):
+    expand = server.expand_peptide_results
+    broken = [True]
+
+    def expand_once_broken(results, peptides):
+        if broken.pop() if broken else False:
+            raise KeyError("metadata")
+        return expand(results, peptides)
+
+    monkeypatch.setattr(server, "expand_peptide_results", expand_once_broken)
+
+    async def main():
+        failed = await asyncio.wait_for(
+            server.predict_peptide_binding(peptides="PKYVKQNTLKLAT", allele="DRB1_0101"), 5
+        )
+        after = await asyncio.wait_for(
+            server.predict_peptide_binding(peptides="PKYVKQNTLKLAT", allele="DRB1_0101"), 5
+        )
+        return failed, after
+
+    failed, after = asyncio.run(main())
+
+    assert failed["status"] == "error"
+    assert after["status"] == "success"
+    assert len(batching) == 2
+
+
+def test_stopped_batcher_is_unregistered_and_fails_waiting_requests(server, batching):
+    async def main():
+        request = asyncio.ensure_future(
+            server.predict_peptide_binding(peptides="PKYVKQNTLKLAT", allele="DRB1_0101")
+        )
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        (task,) = server._batcher_tasks
+        task.cancel()
+        result = await asyncio.wait_for(request, 5)
+        await asyncio.sleep(0)
+        return result
+
+    result = asyncio.run(main())
+
+    assert result["status"] == "error"
+    assert server._batch_queues == {}
+    assert server._batcher_tasks == set()
+
+
+@pytest.mark.parametrize("value, expected", [("25", 25.0), ("0", 0.0), ("abc", 0.0), ("-5", 0.0), ("nan", 0.0)])
+def test_batch_window_is_parsed_defensively(server, monkeypatch, value, expected):
+    monkeypatch.setenv("NETMHCIIPAN_MCP_BATCH_WINDOW_MS", value)
+    assert server._batch_window_ms() == expected
@@ -0,0 +1,61 @@
+"""Tests for job groups from submit_large_peptide_screening."""
+
+import pytest
+
+
+def _submit(server, tmp_path, n_files=2):
+    files = []
+    for i in range(n_files):
+        path = tmp_path / f"peptides_{i}.txt"
+        path.write_text(f"PKYVKQNTLKLAT{i}\n")
+        files.append(str(path))
+    return server.submit_large_peptide_screening(input_files=files, job_name="screen"), files
+
+
+def test_empty_file_list_is_rejected(server):
+    with pytest.raises(ValueError):
+        server.submit_large_peptide_screening(input_files=[])
+    assert server.job_manager.jobs == {}
+
+
+def test_submission_returns_a_trackable_group_job_id(server, tmp_path):
+    response, files = _submit(server, tmp_path)
+
+    assert response["status"] == "submitted"
+    assert response["count"] == 2
+    assert response["job_ids"] == ["job1", "job2"]
+    group_id = response["job_id"]
+    assert server.get_job_status(group_id)["status"] == "pending"
+    assert server.get_aggregate_status(group_id)["counts"] == {"pending": 2}
+
+
+def test_group_status_follows_its_jobs(server, tmp_path):
+    response, _ = _submit(server, tmp_path, n_files=3)
+    group_id = response["job_id"]
+    jobs = server.job_manager.jobs
+
+    jobs["job1"]["status"] = "completed"
+    assert server.get_job_status(group_id)["status"] == "running"
+
+    jobs["job2"]["status"] = jobs["job3"]["status"] = "completed"
+    status = server.get_aggregate_status(group_id)
+    assert status["status"] == "completed"
+    assert status["counts"] == {"completed": 3}
+
+    jobs["job2"]["status"] = "failed"
+    assert server.get_job_status(group_id)["status"] == "failed"
+
+
+def test_group_result_and_cancel_cover_every_job(server, tmp_path):
+    response, files = _submit(server, tmp_path)
+    group_id = response["job_id"]
+
+    result = server.get_job_result(group_id)
+    assert [r["result"] for r in result["results"].values()] == files
+
+    server.cancel_job(group_id)
+    assert server.get_job_status(group_id)["status"] == "cancelled"
+
+
+def test_unknown_group_is_an_error(server):
+    assert server.get_aggregate_status("group_missing")["status"] == "error"